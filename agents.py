@@ -1,4 +1,4 @@
-from typing import Any, TypedDict
+from typing import Annotated, Any, Optional, TypedDict
 from langchain.agents import (
     AgentExecutor,
     create_openai_tools_agent,
@@ -10,15 +10,23 @@ from langchain_openai import ChatOpenAI
 
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
+from async_runner import run_async
 from chains import get_finish_chain, get_supervisor_chain
 from tools import (
     get_job_search_tool,
+    get_job_batch_search_tool,
+    get_cover_letter_batch_tool,
     ResumeExtractorTool,
     generate_letter_for_specific_job,
     get_google_search_results,
     save_cover_letter_for_specific_job,
     scrape_website,
+    scrape_websites_tool,
 )
+from registry import component_registry, config_key
+from resume_profile import format_resume_profile
+from router import fast_route, router_stats
+from workspace import use_workspace
 from prompts import (
     get_search_agent_prompt_template,
     get_analyzer_agent_prompt_template,
@@ -57,19 +65,125 @@ def create_agent(llm: ChatOpenAI, tools: list, system_prompt: str):
     return executor
 
 
+def get_llm(config: dict):
+    """
+    Return the chat model client of the config, built once and shared by all nodes.
+    """
+    return component_registry.get(
+        ("llm", config_key(config)), lambda: init_chat_model(**config)
+    )
+
+
+def get_agent(name: str, config: dict, build_tools, system_prompt: str):
+    """
+    Return the agent executor of the worker for the config, built once and reused.
+
+    Tools are built by `build_tools(llm)` so tools needing the LLM get the shared client.
+    Anything specific to a request (callbacks, resume profile, workspace) is passed at
+    invoke time, never baked into the cached executor.
+    """
+
+    def build():
+        llm = get_llm(config)
+        return create_agent(llm, build_tools(llm), system_prompt)
+
+    return component_registry.get(("agent", name, config_key(config)), build)
+
+
+def with_workspace(node):
+    """
+    Run the node with the workspace of the session as the current one, so its tools read
+    and write that session's files.
+    """
+
+    def run_in_workspace(state):
+        with use_workspace(state.get("workspace_id")):
+            return node(state)
+
+    return run_in_workspace
+
+
+def with_resume_profile(state) -> list:
+    """
+    Messages for a worker agent, preceded by the resume profile when one was uploaded.
+
+    The profile is added at invoke time instead of being baked into the agent prompt, so the
+    same agent works for every resume.
+    """
+    messages = state.get("messages", [])
+    if not state.get("resume_profile"):
+        return messages
+    return [
+        HumanMessage(
+            content=format_resume_profile(state["resume_profile"]), name="ResumeProfile"
+        )
+    ] + messages
+
+
+def get_worker_callback(state):
+    """
+    Create the callback handler showing the steps of one worker.
+
+    Workers run in parallel can't share a handler: the Streamlit handler tracks a single
+    current thought, so each worker gets its own, in its own container.
+    """
+    return state["callback_factory"]()
+
+
+def merge_worker_outputs(current: Optional[dict], update: Optional[dict]) -> dict:
+    """
+    Reducer of the messages written by workers running in parallel, keyed by worker name.
+
+    Workers of the same step write different keys so their updates never conflict. An
+    update of None clears the outputs once the supervisor has merged them.
+    """
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
+
+def as_steps(next_step) -> list:
+    """
+    Normalize the supervisor's decision to the list of nodes to run next.
+
+    Finish only ends the graph on its own, it is dropped when workers are dispatched with it.
+    """
+    steps = [next_step] if isinstance(next_step, str) else list(next_step or [])
+    steps = list(dict.fromkeys(steps))
+    workers = [step for step in steps if step != "Finish"]
+    return workers or ["Finish"]
+
+
 def supervisor_node(state):
     """
     The supervisor node is the main node in the graph. It is responsible for routing to the correct agent.
+
+    It is also where parallel workers join: their messages are appended in the order they
+    were dispatched in, whatever order they finished in.
     """
-    chat_history = state.get("messages", [])
-    llm = init_chat_model(**state["config"])
-    supervisor_chain = get_supervisor_chain(llm)
+    chat_history = list(state.get("messages", []))
     if not chat_history:
         chat_history.append(HumanMessage(state["user_input"]))
-    output = supervisor_chain.invoke({"messages": chat_history})
-    state["next_step"] = output.next_action
-    state["messages"] = chat_history
-    return state
+    worker_outputs = state.get("worker_outputs") or {}
+    for worker in as_steps(state.get("next_step")):
+        if worker in worker_outputs:
+            chat_history.append(worker_outputs[worker])
+    state = {**state, "messages": chat_history}
+
+    # Obvious single-intent routes skip the LLM call
+    next_step = fast_route(state)
+    if next_step is not None:
+        router_stats.add(f"fast:{next_step}")
+        next_steps = [next_step]
+    else:
+        supervisor_chain = component_registry.get(
+            ("supervisor", config_key(state["config"])),
+            lambda: get_supervisor_chain(get_llm(state["config"])),
+        )
+        output = supervisor_chain.invoke({"messages": chat_history})
+        router_stats.add("llm")
+        next_steps = as_steps([output.next_action] + list(output.parallel_actions or []))
+    return {"messages": chat_history, "next_step": next_steps, "worker_outputs": None}
 
 
 def job_search_node(state):
@@ -77,19 +191,23 @@ def job_search_node(state):
     This Node is responsible for searching for jobs from linkedin or any other job search engine.
     Tools: Job Search Tool
     """
-    llm = init_chat_model(**state["config"])
-    search_agent = create_agent(
-        llm, [get_job_search_tool()], get_search_agent_prompt_template()
+    search_agent = get_agent(
+        "JobSearcher",
+        state["config"],
+        lambda llm: [get_job_search_tool(), get_job_batch_search_tool()],
+        get_search_agent_prompt_template(),
     )
-    chat_history = state.get("messages", [])
-    state["callback"].write_agent_name("JobSearcher Agent 💼")
+    chat_history = with_resume_profile(state)
+    callback = get_worker_callback(state)
+    callback.write_agent_name("JobSearcher Agent 💼")
     output = search_agent.invoke(
-        {"messages": chat_history}, {"callbacks": [state["callback"]]}
+        {"messages": chat_history}, {"callbacks": [callback]}
     )
-    state["messages"].append(
-        HumanMessage(content=output.get("output"), name="JobSearcher")
-    )
-    return state
+    return {
+        "worker_outputs": {
+            "JobSearcher": HumanMessage(content=output.get("output"), name="JobSearcher")
+        }
+    }
 
 
 def resume_analyzer_node(state):
@@ -97,76 +215,95 @@ def resume_analyzer_node(state):
     Resume analyzer node will analyze the resume and return the output.
     Tools: Resume Extractor
     """
-    llm = init_chat_model(**state["config"])
-    analyzer_agent = create_agent(
-        llm, [ResumeExtractorTool()], get_analyzer_agent_prompt_template()
+    analyzer_agent = get_agent(
+        "ResumeAnalyzer",
+        state["config"],
+        lambda llm: [ResumeExtractorTool()],
+        get_analyzer_agent_prompt_template(),
     )
-    state["callback"].write_agent_name("ResumeAnalyzer Agent 📄")
+    callback = get_worker_callback(state)
+    callback.write_agent_name("ResumeAnalyzer Agent 📄")
     output = analyzer_agent.invoke(
-        {"messages": state["messages"]}, {"callbacks": [state["callback"]]}
+        {"messages": with_resume_profile(state)}, {"callbacks": [callback]}
     )
-    state["messages"].append(
-        HumanMessage(content=output.get("output"), name="ResumeAnalyzer")
-    )
-    return state
+    return {
+        "worker_outputs": {
+            "ResumeAnalyzer": HumanMessage(
+                content=output.get("output"), name="ResumeAnalyzer"
+            )
+        }
+    }
 
 
 def cover_letter_generator_node(state):
     """
     Node which handles the generation of cover letters.
-    Tools: Cover Letter Generator, Cover Letter Saver
+    Tools: Cover Letter Generator, Cover Letter Saver, Batch Cover Letter Generator
     """
-    llm = init_chat_model(**state["config"])
-    generator_agent = create_agent(
-        llm,
-        [
+    generator_agent = get_agent(
+        "CoverLetterGenerator",
+        state["config"],
+        lambda llm: [
             generate_letter_for_specific_job,
             save_cover_letter_for_specific_job,
             ResumeExtractorTool(),
+            get_cover_letter_batch_tool(llm),
         ],
         get_generator_agent_prompt_template(),
     )
 
-    state["callback"].write_agent_name("CoverLetterGenerator Agent ✍️")
+    callback = get_worker_callback(state)
+    callback.write_agent_name("CoverLetterGenerator Agent ✍️")
     output = generator_agent.invoke(
-        {"messages": state["messages"]}, {"callbacks": [state["callback"]]}
-    )
-    state["messages"].append(
-        HumanMessage(
-            content=output.get("output"),
-            name="CoverLetterGenerator",
-        )
+        {"messages": with_resume_profile(state)}, {"callbacks": [callback]}
     )
+    return {
+        "worker_outputs": {
+            "CoverLetterGenerator": HumanMessage(
+                content=output.get("output"),
+                name="CoverLetterGenerator",
+            )
+        }
+    }
 
 
 def web_research_node(state):
     """
     Node which handles the web research.
-    Tools: Google Search, Web Scraper
+    Tools: Google Search, Web Scraper, Batch Web Scraper
     """
-    llm = init_chat_model(**state["config"])
-    research_agent = create_agent(
-        llm,
-        [get_google_search_results, scrape_website],
+    research_agent = get_agent(
+        "WebResearcher",
+        state["config"],
+        lambda llm: [get_google_search_results, scrape_website, scrape_websites_tool],
         researcher_agent_prompt_template(),
     )
-    state["callback"].write_agent_name("WebResearcher Agent 🔍")
-    output = research_agent.invoke(
-        {"messages": state["messages"]}, {"callbacks": [state["callback"]]}
-    )
-    state["messages"].append(
-        HumanMessage(content=output.get("output"), name="WebResearcher")
+    callback = get_worker_callback(state)
+    callback.write_agent_name("WebResearcher Agent 🔍")
+    # Run asynchronously so the searches the agent requests in one step run concurrently
+    output = run_async(
+        research_agent.ainvoke(
+            {"messages": state["messages"]}, {"callbacks": [callback]}
+        )
     )
-    return state
+    return {
+        "worker_outputs": {
+            "WebResearcher": HumanMessage(content=output.get("output"), name="WebResearcher")
+        }
+    }
 
 
 def chatbot_node(state):
-    llm = init_chat_model(**state["config"])
-    finish_chain = get_finish_chain(llm)
-    state["callback"].write_agent_name("ChatBot Agent 🤖")
+    finish_chain = component_registry.get(
+        ("finish", config_key(state["config"])),
+        lambda: get_finish_chain(get_llm(state["config"])),
+    )
+    callback = get_worker_callback(state)
+    callback.write_agent_name("ChatBot Agent 🤖")
     output = finish_chain.invoke({"messages": state["messages"]})
-    state["messages"].append(AIMessage(content=output.content, name="ChatBot"))
-    return state
+    return {
+        "worker_outputs": {"ChatBot": AIMessage(content=output.content, name="ChatBot")}
+    }
 
 
 def define_graph():
@@ -176,11 +313,11 @@ def define_graph():
         graph (StateGraph): The compiled graph representing the workflow.
     """
     workflow = StateGraph(AgentState)
-    workflow.add_node("ResumeAnalyzer", resume_analyzer_node)
-    workflow.add_node("JobSearcher", job_search_node)
-    workflow.add_node("CoverLetterGenerator", cover_letter_generator_node)
+    workflow.add_node("ResumeAnalyzer", with_workspace(resume_analyzer_node))
+    workflow.add_node("JobSearcher", with_workspace(job_search_node))
+    workflow.add_node("CoverLetterGenerator", with_workspace(cover_letter_generator_node))
     workflow.add_node("Supervisor", supervisor_node)
-    workflow.add_node("WebResearcher", web_research_node)
+    workflow.add_node("WebResearcher", with_workspace(web_research_node))
     workflow.add_node("ChatBot", chatbot_node)
 
     members = [
@@ -193,14 +330,16 @@ def define_graph():
     workflow.set_entry_point("Supervisor")
 
     for member in members:
-        # We want our workers to ALWAYS "report back" to the supervisor when done
+        # We want our workers to ALWAYS "report back" to the supervisor when done.
+        # Workers dispatched together run as parallel branches and the supervisor runs
+        # once they have all finished.
         workflow.add_edge(member, "Supervisor")
 
     conditional_map = {k: k for k in members}
     conditional_map["Finish"] = END
 
     workflow.add_conditional_edges(
-        "Supervisor", lambda x: x["next_step"], conditional_map
+        "Supervisor", lambda x: as_steps(x["next_step"]), conditional_map
     )
 
     graph = workflow.compile()
@@ -211,6 +350,9 @@ def define_graph():
 class AgentState(TypedDict):
     user_input: str
     messages: list[BaseMessage]
-    next_step: str
+    next_step: list[str]
     config: dict
-    callback: Any
+    callback_factory: Any
+    resume_profile: dict
+    workspace_id: str
+    worker_outputs: Annotated[dict, merge_worker_outputs]
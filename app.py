@@ -11,6 +11,10 @@ from streamlit.delta_generator import DeltaGenerator
 from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from custom_callback_handler import CustomStreamlitCallbackHandler
 from agents import define_graph
+from resume_profile import build_resume_profile
+from workspace import WorkspaceQuotaError, workspace_manager
+import uuid
+import hashlib
 import shutil
 
 load_dotenv()
@@ -34,11 +38,12 @@ st.markdown("[Connect with me on LinkedIn](https://www.linkedin.com/in/aman-vary
 streamlit_analytics.start_tracking()
 
 # Setup directories and paths
-temp_dir = "temp"
 dummy_resume_path = os.path.abspath("dummy_resume.pdf")
 
-if not os.path.exists(temp_dir):
-    os.makedirs(temp_dir)
+# Every browser session gets its own workspace for the resume and the generated files
+if "workspace_id" not in st.session_state:
+    st.session_state["workspace_id"] = uuid.uuid4().hex
+workspace = workspace_manager.get(st.session_state["workspace_id"])
 
 # Add dummy resume if it does not exist
 if not os.path.exists(dummy_resume_path):
@@ -55,9 +60,25 @@ if not uploaded_document:
     
 bytes_data = uploaded_document.read()
 
-filepath = os.path.join(temp_dir, "resume.pdf")
-with open(filepath, "wb") as f:
-    f.write(bytes_data)
+filepath = workspace.resume_path
+resume_hash = hashlib.sha256(bytes_data).hexdigest()
+# Write the resume and build its profile only when the upload changes, not on every rerun
+if st.session_state.get("resume_hash") != resume_hash or not os.path.exists(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+    try:
+        workspace.check_quota(len(bytes_data))
+    except WorkspaceQuotaError as exc:
+        st.error("The resume is too large for this session's storage.")
+        st.stop()
+    with open(filepath, "wb") as f:
+        f.write(bytes_data)
+    try:
+        st.session_state["resume_profile"] = build_resume_profile(filepath)
+    except Exception as exc:
+        print(f"Error in building the resume profile -> {exc}")
+        st.session_state["resume_profile"] = None
+    st.session_state["resume_hash"] = resume_hash
 
 st.markdown("**Resume uploaded successfully!**")
 
@@ -127,8 +148,13 @@ st.sidebar.markdown(
     unsafe_allow_html=True,
 )
 
-# Create the agent flow
-flow_graph = define_graph()
+# Create the agent flow once per process, not on every rerun
+@st.cache_resource
+def get_flow_graph():
+    return define_graph()
+
+
+flow_graph = get_flow_graph()
 message_history = StreamlitChatMessageHistory()
 
 # Initialize session state variables
@@ -169,27 +195,56 @@ def initialize_callback_handler(main_container: DeltaGenerator):
 
     return streamlit_callback_instance
 
+def callback_handler_factory(main_container: DeltaGenerator):
+    """
+    Return a function creating a callback handler in a new container of `main_container`.
+
+    Every worker gets its own handler. Workers run on the graph's threads, so the script
+    run context of this session is attached to the calling thread first.
+    """
+    context = get_script_run_ctx()
+
+    def new_callback_handler():
+        add_script_run_ctx(ctx=context)
+        return initialize_callback_handler(main_container.container())
+
+    return new_callback_handler
+
+def format_turn_output(turn_messages):
+    """
+    The reply of a turn: the answer of every worker that ran, in order, so the answers of
+    workers run in parallel are all shown.
+    """
+    if len(turn_messages) == 1:
+        return turn_messages[0].content
+    return "\n\n".join(
+        f"**{worker_message.name}**\n\n{worker_message.content}"
+        for worker_message in turn_messages
+    )
+
 def execute_chat_conversation(user_input, graph):
-    callback_handler_instance = initialize_callback_handler(st.container())
-    callback_handler = callback_handler_instance
+    new_callback_handler = callback_handler_factory(st.container())
+    input_messages = list(message_history.messages) + [user_input]
     try:
         output = graph.invoke(
             {
-                "messages": list(message_history.messages) + [user_input],
+                "messages": input_messages,
                 "user_input": user_input,
                 "config": settings,
-                "callback": callback_handler,
+                "callback_factory": new_callback_handler,
+                "resume_profile": st.session_state.get("resume_profile"),
+                "workspace_id": st.session_state["workspace_id"],
             },
             {"recursion_limit": 30},
         )
-        message_output = output.get("messages")[-1]
         messages_list = output.get("messages")
+        turn_messages = messages_list[len(input_messages):] or messages_list[-1:]
         message_history.clear()
         message_history.add_messages(messages_list)
 
     except Exception as exc:
         return ":( Sorry, Some error occurred. Can you please try again?"
-    return message_output.content
+    return format_turn_output(turn_messages)
 
 # Clear Chat functionality
 if st.button("Clear Chat"):
@@ -0,0 +1,153 @@
+import os
+import atexit
+import asyncio
+import threading
+import contextvars
+import concurrent.futures
+import weakref
+from typing import Any, Callable, Coroutine, Optional
+
+import aiohttp
+
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 20))
+HTTP_POOL_SIZE_PER_HOST = int(os.environ.get("HTTP_POOL_SIZE_PER_HOST", 10))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 60))
+
+
+def _copy_task_outcome(task: asyncio.Task, future: concurrent.futures.Future) -> None:
+    if future.cancelled():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+class BackgroundLoop:
+    """
+    A process-wide event loop running in a daemon thread.
+
+    Tools are called synchronously by the agents, so instead of paying for a new loop and new
+    connections with `asyncio.run` on every call they submit their coroutines here. The loop
+    and the HTTP connection pools it owns live until the process exits.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="async-runner",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run the coroutine on the background loop and block until it returns.
+        """
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() can't be called from the background loop itself")
+
+        # The task runs in a copy of the caller's context, so context variables (e.g. the
+        # current session workspace) are visible to the coroutine
+        context = contextvars.copy_context()
+        future = concurrent.futures.Future()
+
+        def start():
+            task = loop.create_task(coro, context=context)
+            task.add_done_callback(lambda done: _copy_task_outcome(done, future))
+
+        loop.call_soon_threadsafe(start)
+        return future.result(timeout)
+
+    def get_session(
+        self, name: str = "default", resolver_factory: Optional[Callable] = None
+    ) -> aiohttp.ClientSession:
+        """
+        Return the keep-alive HTTP session of the running loop, creating it on first use.
+
+        A session can only be used from the loop it was created on, so loops other than the
+        background one (e.g. `asyncio.run` in scripts) get their own pool. Sessions needing
+        their own connector settings, e.g. the scraper's address filtering resolver, get
+        their own `name` and are created with `resolver_factory()` as their resolver.
+        """
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.setdefault(loop, {})
+        session = sessions.get(name)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                resolver=resolver_factory() if resolver_factory else None,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            sessions[name] = session
+        return session
+
+    async def close_session(self) -> None:
+        """
+        Close the HTTP sessions of the running loop, if it has any.
+        """
+        sessions = self._sessions.pop(asyncio.get_running_loop(), {})
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Close the pooled connections and stop the background loop.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.close_session(), loop).result(timeout)
+        except Exception as exc:
+            print(f"Error in closing the HTTP session -> {exc}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+
+
+background_loop = BackgroundLoop()
+atexit.register(background_loop.shutdown)
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run the coroutine on the shared background loop from synchronous code.
+    """
+    return background_loop.run(coro, timeout)
+
+
+def get_http_session(
+    name: str = "default", resolver_factory: Optional[Callable] = None
+) -> aiohttp.ClientSession:
+    """
+    Return the pooled HTTP session for the current event loop, see `BackgroundLoop.get_session`.
+    """
+    return background_loop.get_session(name, resolver_factory)
+
+
+async def close_http_session() -> None:
+    """
+    Close the pooled HTTP session of the current event loop, e.g. before `asyncio.run` returns.
+    """
+    await background_loop.close_session()
@@ -0,0 +1,103 @@
+"""
+Job search throughput benchmark against the local LinkedIn stand-in server.
+
+Runs several searches concurrently through `search.stream_job_search` and reports jobs/sec
+and p50/p95 latencies, both per search and per job (time from the start of its search to
+its details being available). The job cache and index live in a throwaway directory, so
+every run hits the network path.
+
+Usage:
+    python benchmarks/bench_job_search.py --searches 8 --limit 25 --latency-ms 150 --throttle-rate 0.05
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from linkedin_stub_server import LinkedinStub, start_stub_server  # noqa: E402
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+async def run_benchmark(args):
+    stub = LinkedinStub(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_results=args.limit * 2,
+        seed=args.seed,
+    )
+    runner, base_url = await start_stub_server(stub)
+
+    # Settings are read when search.py is imported
+    os.environ["LINKEDIN_BASE_URL"] = base_url
+    os.environ["LINKEDIN_SEARCH"] = ""
+    os.environ["JOB_SEARCH_MODE"] = "online"
+    os.environ["JOB_FETCH_BACKOFF"] = str(args.backoff)
+    from async_runner import close_http_session
+    import search
+
+    search_latencies, job_latencies = [], []
+
+    async def one_search(i):
+        started = time.perf_counter()
+        async for _ in search.stream_job_search(
+            keywords=f"generative ai engineer {i}",
+            location_name="India",
+            limit=args.limit,
+            batch_size=args.concurrency,
+        ):
+            job_latencies.append(time.perf_counter() - started)
+        search_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one_search(i) for i in range(args.searches)])
+    elapsed = time.perf_counter() - started
+
+    await close_http_session()
+    await runner.cleanup()
+
+    print(f"searches: {args.searches}  limit: {args.limit}  concurrency: {args.concurrency}")
+    print(f"stub responses by status: {dict(sorted(stub.stats.items()))}")
+    print(f"jobs fetched: {len(job_latencies)} in {elapsed:.2f}s -> {len(job_latencies) / elapsed:.1f} jobs/sec")
+    print(
+        f"per search latency: p50 {percentile(search_latencies, 0.5) * 1000:.0f} ms, "
+        f"p95 {percentile(search_latencies, 0.95) * 1000:.0f} ms"
+    )
+    print(
+        f"per job latency:    p50 {percentile(job_latencies, 0.5) * 1000:.0f} ms, "
+        f"p95 {percentile(job_latencies, 0.95) * 1000:.0f} ms, "
+        f"mean {statistics.mean(job_latencies or [0]) * 1000:.0f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--backoff", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CACHE_DIR"] = cache_dir
+        asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of the HTML extraction backends over the saved LinkedIn fixtures.
+
+Usage:
+    python benchmarks/bench_parsers.py [--iterations 200]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import PARSER_BACKENDS  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures():
+    job_pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "job_posting_*.html"))):
+        with open(path, encoding="utf-8") as f:
+            job_pages.append(f.read())
+    with open(os.path.join(FIXTURES_DIR, "search_page.html"), encoding="utf-8") as f:
+        search_page = f.read()
+    return job_pages, search_page
+
+
+def time_per_call(func, pages, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            func(page)
+    return (time.perf_counter() - start) / (iterations * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    job_pages, search_page = load_fixtures()
+    results = {}
+    for name, backend_cls in PARSER_BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except Exception as exc:
+            print(f"Skipping {name} -> {exc}")
+            continue
+        results[name] = (
+            time_per_call(backend.parse_job_details, job_pages, args.iterations),
+            time_per_call(backend.parse_job_ids, [search_page], args.iterations),
+            backend.parse_job_details(job_pages[0]),
+        )
+
+    print(f"{'backend':<8} {'job page (ms)':>14} {'search page (ms)':>17}")
+    for name, (details_time, ids_time, _) in results.items():
+        print(f"{name:<8} {details_time * 1000:>14.3f} {ids_time * 1000:>17.3f}")
+
+    # The backends have to agree, otherwise the numbers above mean nothing
+    extracted = [job for _, _, job in results.values()]
+    if any(job != extracted[0] for job in extracted[1:]):
+        print("WARNING: backends extracted different fields from the same page")
+
+
+if __name__ == "__main__":
+    main()
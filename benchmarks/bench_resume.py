@@ -0,0 +1,98 @@
+"""
+Resume extraction benchmark: LangChain's PyMuPDFLoader against data_loader.parse_resume.
+
+Generates resumes of several page counts with PyMuPDF, then times the previous loader
+(PyMuPDFLoader plus string concatenation) against the direct PyMuPDF path, serial and with
+page ranges extracted in parallel processes.
+
+Usage:
+    python benchmarks/bench_resume.py --pages 2 10 50 200 --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SECTIONS = {
+    "SUMMARY": "Machine learning engineer with 6 years of experience shipping NLP products, "
+    "from retrieval pipelines to fine-tuned language models serving millions of users.",
+    "SKILLS": "Python, PyTorch, LangChain, LangGraph, FastAPI, PostgreSQL, Docker, Kubernetes, "
+    "AWS SageMaker, vector databases, prompt engineering, evaluation harnesses.",
+    "EXPERIENCE": "Senior ML Engineer, Acme Corp, 2021 - present. Built a retrieval-augmented "
+    "support assistant answering 40k questions a day. Cut inference cost by 55% with "
+    "quantization and batching. Led a team of four engineers.",
+    "PROJECTS": "Open-source evaluation toolkit for RAG systems with 2k GitHub stars. "
+    "Resume screening assistant built on LangGraph agents.",
+    "EDUCATION": "B.Tech in Computer Science, Indian Institute of Technology, 2018.",
+}
+
+
+def make_resume(path, pages):
+    import pymupdf
+
+    pdf = pymupdf.open()
+    for number in range(pages):
+        page = pdf.new_page()
+        rect = pymupdf.Rect(54, 54, page.rect.width - 54, page.rect.height - 54)
+        text = f"Jane Doe - page {number + 1}\n\n" + "\n\n".join(
+            f"{heading}\n{body} {body}" for heading, body in SECTIONS.items()
+        )
+        page.insert_textbox(rect, text, fontsize=10)
+    pdf.save(path)
+
+
+def old_load_resume(file_path):
+    from langchain_community.document_loaders import PyMuPDFLoader
+
+    pages = PyMuPDFLoader(file_path).load()
+    page_content = ""
+    for page in pages:
+        page_content += page.page_content
+    return page_content
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    import data_loader
+
+    print(f"{'pages':>6} {'PyMuPDFLoader':>14} {'parse_resume':>13} {'parallel':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for pages in args.pages:
+            path = os.path.join(tmp_dir, f"resume_{pages}.pdf")
+            make_resume(path, pages)
+
+            old = timed(lambda: old_load_resume(path), args.repeat)
+
+            data_loader.RESUME_PARALLEL_MIN_PAGES = 10**9
+            serial = timed(lambda: data_loader.parse_resume(path), args.repeat)
+
+            data_loader.RESUME_PARALLEL_MIN_PAGES = 1
+            data_loader.RESUME_PARSE_WORKERS = args.workers
+            data_loader.parse_resume(path)  # start the worker processes outside the timing
+            parallel = timed(lambda: data_loader.parse_resume(path), args.repeat)
+
+            print(
+                f"{pages:>6} {old * 1000:>11.1f} ms {serial * 1000:>10.1f} ms "
+                f"{parallel * 1000:>6.1f} ms {old / min(serial, parallel):>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Scraper latency benchmark: local HTML-to-text backend against the FireCrawl service.
+
+A local static-file server serves the fixtures with injected latency. The local backend
+scrapes fixtures/article_page.html there, and fixtures/spa_page.html checks that
+client-rendered pages are detected for the FireCrawl fallback. FireCrawl can't reach a local
+server, so it is compared on a public url (--public-url, needs FIRECRAWL_API_KEY), where both
+backends scrape the same page. The cache lives in a throwaway directory and is bypassed.
+
+Usage:
+    python benchmarks/bench_scraper.py --requests 50 --concurrency 5 --latency-ms 50
+    FIRECRAWL_API_KEY=... python benchmarks/bench_scraper.py --public-url https://example.com/post
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def report(name, latencies, elapsed):
+    print(
+        f"{name:<22} {len(latencies):>4} pages in {elapsed:6.2f}s  "
+        f"p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  "
+        f"mean {statistics.mean(latencies or [0]) * 1000:7.1f} ms"
+    )
+
+
+async def start_static_server(latency_ms: float):
+    @web.middleware
+    async def latency(request, handler):
+        await asyncio.sleep(latency_ms / 1000)
+        return await handler(request)
+
+    app = web.Application(middlewares=[latency])
+    app.router.add_static("/", FIXTURES_DIR)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def measure(scrape, url, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await scrape(url)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies, time.perf_counter() - started
+
+
+async def run_benchmark(args):
+    runner, base_url = await start_static_server(args.latency_ms)
+    from async_runner import close_http_session
+    from utils import FireCrawlClient, LocalScraper, NeedsRenderingError
+
+    local_scraper = LocalScraper()
+    latencies, elapsed = await measure(
+        local_scraper.scrape_async, f"{base_url}/article_page.html", args.requests, args.concurrency
+    )
+    report("local (static server)", latencies, elapsed)
+
+    try:
+        await local_scraper.scrape_async(f"{base_url}/spa_page.html")
+        print("spa_page.html: extracted locally (expected a FireCrawl fallback)")
+    except NeedsRenderingError as exc:
+        print(f"spa_page.html: needs rendering, auto backend falls back to FireCrawl ({exc})")
+
+    if args.public_url:
+        requests = min(args.requests, args.public_requests)
+        latencies, elapsed = await measure(
+            local_scraper.scrape_async, args.public_url, requests, args.concurrency
+        )
+        report("local (public url)", latencies, elapsed)
+        if os.environ.get("FIRECRAWL_API_KEY"):
+            firecrawl_client = FireCrawlClient()
+
+            async def firecrawl_scrape(url):
+                await asyncio.to_thread(firecrawl_client.scrape_uncached, url)
+
+            latencies, elapsed = await measure(
+                firecrawl_scrape, args.public_url, requests, args.concurrency
+            )
+            report("firecrawl (public url)", latencies, elapsed)
+        else:
+            print("FIRECRAWL_API_KEY is not set, skipping the FireCrawl comparison")
+
+    await close_http_session()
+    await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--public-url", default=None)
+    parser.add_argument("--public-requests", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CACHE_DIR"] = cache_dir
+        # The static server listens on 127.0.0.1
+        os.environ["LOCAL_SCRAPE_ALLOW_PRIVATE"] = "true"
+        asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
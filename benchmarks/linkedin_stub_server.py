@@ -0,0 +1,146 @@
+"""
+Local stand-in for the LinkedIn guest job API, replaying the recorded HTML fixtures.
+
+Search pages are generated from fixtures/search_page.html with job ids that depend on the
+keywords and the `start` offset, job postings are served from fixtures/job_posting_*.html.
+Latency, server errors and 429 throttling can be injected to reproduce production conditions.
+
+Usage:
+    python benchmarks/linkedin_stub_server.py --port 8089 --latency-ms 150 --throttle-rate 0.05
+    CACHE_DIR=$(mktemp -d) LINKEDIN_BASE_URL=http://127.0.0.1:8089 streamlit run app.py
+
+The app caches and indexes the stub's postings apart from LinkedIn's anyway, a throwaway
+CACHE_DIR keeps them out of the real cache directory altogether.
+"""
+import os
+import re
+import glob
+import random
+import asyncio
+import zlib
+import argparse
+
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGE_SIZE = 10
+
+
+class LinkedinStub:
+    """
+    Serves the recorded LinkedIn pages with configurable latency and failures.
+
+    Attributes:
+        latency_ms (float): Mean response latency, every response waits 50% to 150% of it.
+        error_rate (float): Fraction of requests answered with a 503.
+        throttle_rate (float): Fraction of requests answered with a 429.
+        max_results (int): Number of results a search returns before running out of pages.
+        stats (dict): Number of responses served per status.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 100,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_results: int = 100,
+        seed: int = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_results = max_results
+        self.stats = {}
+        self._random = random.Random(seed)
+
+        with open(os.path.join(FIXTURES_DIR, "search_page.html"), encoding="utf-8") as f:
+            self._search_card = f.read().split("</li>")[0] + "</li>"
+        self._job_postings = []
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "job_posting_*.html"))):
+            with open(path, encoding="utf-8") as f:
+                self._job_postings.append(f.read())
+
+    def _count(self, status: int) -> None:
+        self.stats[status] = self.stats.get(status, 0) + 1
+
+    async def _simulate_network(self):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms * self._random.uniform(0.5, 1.5) / 1000)
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            self._count(429)
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if roll < self.throttle_rate + self.error_rate:
+            self._count(503)
+            return web.Response(status=503)
+        return None
+
+    async def search(self, request: web.Request) -> web.Response:
+        failure = await self._simulate_network()
+        if failure is not None:
+            return failure
+
+        start = int(request.query.get("start", 0))
+        # Different keywords give different, but stable, job ids
+        base_id = 3_000_000_000 + zlib.crc32(request.query.get("keywords", "").encode()) % 10**8
+        cards = []
+        for rank in range(start, min(start + PAGE_SIZE, self.max_results)):
+            card = re.sub(r"jobPosting:\d+", f"jobPosting:{base_id + rank}", self._search_card)
+            cards.append(card)
+        self._count(200)
+        return web.Response(text="\n".join(cards), content_type="text/html")
+
+    async def job_posting(self, request: web.Request) -> web.Response:
+        failure = await self._simulate_network()
+        if failure is not None:
+            return failure
+
+        job_id = request.match_info["job_id"]
+        html = self._job_postings[int(job_id) % len(self._job_postings)]
+        self._count(200)
+        return web.Response(text=html, content_type="text/html")
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/jobs-guest/jobs/api/seeMoreJobPostings/search/", self.search)
+        app.router.add_get("/jobs-guest/jobs/api/jobPosting/{job_id}", self.job_posting)
+        return app
+
+
+async def start_stub_server(stub: LinkedinStub, host: str = "127.0.0.1", port: int = 0):
+    """
+    Start the stub server on the running loop.
+
+    Returns:
+        tuple: The aiohttp runner (call `cleanup()` to stop it) and the base URL it listens on.
+    """
+    runner = web.AppRunner(stub.make_app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-results", type=int, default=100)
+    args = parser.parse_args()
+
+    stub = LinkedinStub(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_results=args.max_results,
+    )
+    print(f"Serving LinkedIn stand-in on http://{args.host}:{args.port}")
+    web.run_app(stub.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
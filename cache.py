@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+CACHE_DIR = os.environ.get("CACHE_DIR", ".cache")
+# Expired entries of a namespace are deleted by its writes at most this often
+CACHE_PURGE_INTERVAL = int(os.environ.get("CACHE_PURGE_INTERVAL", 10 * 60))
+
+
+class TTLCache:
+    """
+    A persistent key/value store backed by SQLite where every entry expires after a TTL.
+
+    Values are stored as JSON so anything the tools return (dicts, lists, strings) can be cached.
+    A single database file is shared by all namespaces and is safe to use from several threads
+    and several processes. Writes delete the expired entries of the namespace every
+    CACHE_PURGE_INTERVAL seconds so the file doesn't grow forever.
+
+    Attributes:
+        namespace (str): Logical name of the cache, used to separate entries in the shared table.
+        ttl (int): Number of seconds an entry stays valid.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that were missing or expired.
+    """
+
+    def __init__(
+        self, namespace: str, ttl: int = 3600, path: Optional[str] = None
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.path = path or os.path.join(CACHE_DIR, "cache.db")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._last_purge = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Open lazily so importing a module never touches the disk
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (namespace, expires_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        """
+        Return the cached value for the key, or None if it is missing or expired.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        """
+        Look up several keys at once.
+
+        Returns:
+            dict: Mapping of the keys that were found to their values. Missing keys are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND expires_at > ? "
+                f"AND key IN ({placeholders})",
+                [self.namespace, time.time(), *keys],
+            ).fetchall()
+            found = {key: json.loads(value) for key, value in rows}
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value under the key, replacing any previous entry.
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: dict) -> None:
+        """
+        Store several values at once.
+        """
+        if not items:
+            return
+        expires_at = time.time() + self.ttl
+        rows = [
+            (self.namespace, key, json.dumps(value), expires_at)
+            for key, value in items.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            if time.time() - self._last_purge >= CACHE_PURGE_INTERVAL:
+                self._purge_expired(conn)
+            conn.commit()
+
+    def _purge_expired(self, conn: sqlite3.Connection) -> int:
+        self._last_purge = time.time()
+        cursor = conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, self._last_purge),
+        )
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries of this namespace.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        with self._lock:
+            conn = self._connection()
+            deleted = self._purge_expired(conn)
+            conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        """
+        Return the hit/miss counters of this cache.
+        """
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class LRUCache:
+    """
+    A thread-safe in-memory cache that keeps the `maxsize` most recently used entries for `ttl` seconds.
+
+    Meant to sit in front of a `TTLCache` so hot keys don't pay for a SQLite lookup.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 3600) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Return the cached value for the key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one.
+
+    The first caller of a key runs the function, callers arriving while it is in flight wait
+    for and share its result (or exception) instead of repeating the work.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    Async counterpart of `SingleFlight` for coroutines running on one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the request for the others
+        return await asyncio.shield(task)
@@ -1,9 +1,14 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
 from typing import List
 
 from members import get_team_members_details
-from prompts import get_supervisor_prompt_template, get_finish_step_prompt
+from prompts import (
+    get_supervisor_prompt_template,
+    get_finish_step_prompt,
+    get_cover_letter_prompt,
+)
 from schemas import RouteSchema
 
 
@@ -76,3 +81,19 @@ def get_finish_chain(llm: BaseChatModel):
     )
     finish_chain = prompt | llm
     return finish_chain
+
+
+def get_cover_letter_chain(llm: BaseChatModel):
+    """
+    Returns a chain writing the cover letter for one job, given the "resume" and "job" text.
+
+    Used for batch generation, where `chain.batch` writes the letters concurrently.
+    """
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", get_cover_letter_prompt()),
+            ("human", "Resume:\n{resume}\n\nJob:\n{job}"),
+        ]
+    )
+    cover_letter_chain = prompt | llm | StrOutputParser()
+    return cover_letter_chain
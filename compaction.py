@@ -0,0 +1,138 @@
+import os
+import re
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional, fall back to a character estimate
+    _encoding = None
+
+JOB_DESC_TOKEN_BUDGET = int(os.environ.get("JOB_DESC_TOKEN_BUDGET", 350))
+JOB_RESULTS_TOKEN_BUDGET = int(os.environ.get("JOB_RESULTS_TOKEN_BUDGET", 2500))
+# Short intro kept in front of the extracted sections so the agent knows what the team does
+INTRO_CHARS = 300
+
+# Section headings worth keeping for matching a candidate to a job
+KEY_SECTION_HEADING = re.compile(
+    r"^(key )?(responsibilit|duties|what you('ll| will) (do|be doing)|the role|your role|"
+    r"requirements|qualifications|what you('ll)? (bring|need)|who you are|skills|"
+    r"must[- ]have|nice[- ]to[- ]have|preferred|experience)",
+    re.IGNORECASE,
+)
+# Section headings whose content is the same for every job of a company
+BOILERPLATE_HEADING = re.compile(
+    r"^(equal (employment )?opportunity|eeo|diversity|accommodation|privacy|disclaimer|"
+    r"benefits|perks|what we offer|why join|how to apply|about (us|the company))",
+    re.IGNORECASE,
+)
+BOILERPLATE_LINE = re.compile(
+    r"(equal opportunity employer|without regard to|reasonable accommodation|e-verify|"
+    r"protected veteran|sexual orientation|gender identity|national origin|^show (more|less)$|"
+    r"^seniority level|^employment type|^job function|^industries|^referrals increase)",
+    re.IGNORECASE,
+)
+# A sentence end directly followed by a capital letter
+LIST_ITEM_BOUNDARY = re.compile(r"(?<=[a-z0-9)][.!?])(?=[A-Z])")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Count the tokens of the text with tiktoken, or estimate them at 4 characters per token.
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut the text down to at most `max_tokens` tokens, marking the cut with an ellipsis.
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        tokens = _encoding.encode(text, disallowed_special=())
+        truncated = _encoding.decode(tokens[:max_tokens])
+    else:
+        truncated = text[: max_tokens * 4]
+    return truncated.rstrip() + " ..."
+
+
+def normalize_whitespace(text: str) -> list:
+    """
+    Split the text into non-empty lines with runs of whitespace collapsed.
+
+    List items LinkedIn renders without whitespace between them ("...pipelines.Fine-tune...")
+    are split onto their own lines.
+    """
+    text = LIST_ITEM_BOUNDARY.sub("\n", text or "")
+    return [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+
+
+def _is_heading(line: str) -> bool:
+    return len(line) <= 60 and not line.endswith(".")
+
+
+def compact_job_description(text: str, max_tokens: int = JOB_DESC_TOKEN_BUDGET) -> str:
+    """
+    Reduce a job description to what matters for matching and fit it in a token budget.
+
+    Whitespace is normalized, boilerplate sections and lines (EEO statements, benefits,
+    LinkedIn's job criteria) are dropped, and if responsibilities/requirements sections
+    can be found only a short intro plus those sections are kept. A boilerplate section
+    ends at the next key section heading or "...:" heading. If nothing is left the
+    normalized text is used.
+    """
+    lines = normalize_whitespace(text)
+
+    intro, key_sections, other = [], [], []
+    section = intro
+    for line in lines:
+        if _is_heading(line) and BOILERPLATE_HEADING.match(line):
+            section = None
+            continue
+        if _is_heading(line) and KEY_SECTION_HEADING.match(line):
+            section = key_sections
+        elif _is_heading(line) and line.endswith(":"):
+            section = other
+        if section is None or BOILERPLATE_LINE.search(line):
+            continue
+        section.append(line)
+
+    if key_sections:
+        intro_text = " ".join(intro)
+        if len(intro_text) > INTRO_CHARS:
+            intro_text = intro_text[:INTRO_CHARS].rsplit(" ", 1)[0] + " ..."
+        compacted = "\n".join(([intro_text] if intro_text else []) + key_sections)
+    else:
+        compacted = "\n".join(intro + other)
+    if not compacted:
+        compacted = "\n".join(lines)
+
+    return truncate_to_tokens(compacted, max_tokens)
+
+
+def compact_jobs(
+    jobs: list,
+    max_tokens_per_job: int = JOB_DESC_TOKEN_BUDGET,
+    max_tokens_total: int = JOB_RESULTS_TOKEN_BUDGET,
+) -> list:
+    """
+    Compact the descriptions of all jobs of a tool call so they fit a shared token budget.
+
+    Every job gets an equal share of `max_tokens_total` for its description, capped at
+    `max_tokens_per_job`.
+    """
+    if not jobs:
+        return jobs
+    budget = min(max_tokens_per_job, max_tokens_total // len(jobs))
+    return [
+        {
+            **job,
+            "job_desc_text": compact_job_description(job.get("job_desc_text"), budget),
+        }
+        for job in jobs
+    ]
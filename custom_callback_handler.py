@@ -1,3 +1,4 @@
+import threading
 from typing import Any
 from langchain_community.callbacks import StreamlitCallbackHandler
 from streamlit.external.langchain.streamlit_callback_handler import (
@@ -8,5 +9,69 @@ from langchain.schema import AgentAction
 
 
 class CustomStreamlitCallbackHandler(StreamlitCallbackHandler):
+    """
+    Streamlit callback handler that keeps up with tool calls running concurrently.
+
+    The base handler has a single current thought and completes it when a tool ends, so an
+    agent running several tool calls at once (`ainvoke`) lost track of the others. Every
+    tool run gets a thought of its own, the first one continuing the thought of the LLM
+    call that requested it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sync handlers of async runs are called from worker threads
+        self._lock = threading.RLock()
+        self._tool_thoughts = {}
+
     def write_agent_name(self, name: str):
         self._parent_container.write(name)
+
+    def _new_thought(self) -> LLMThought:
+        return LLMThought(
+            parent_container=self._parent_container,
+            labeler=self._thought_labeler,
+            expanded=self._expand_new_thoughts,
+            collapse_on_complete=self._collapse_completed_thoughts,
+        )
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            super().on_llm_start(*args, **kwargs)
+
+    def on_agent_action(self, action: AgentAction, color=None, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._current_thought is None:
+                self._current_thought = self._new_thought()
+            self._current_thought.on_agent_action(action, color, **kwargs)
+
+    def on_tool_start(self, serialized: dict, input_str: str, **kwargs: Any) -> None:
+        with self._lock:
+            thought = self._current_thought
+            if thought is None or thought in self._tool_thoughts.values():
+                thought = self._new_thought()
+            self._tool_thoughts[kwargs.get("run_id")] = thought
+            thought.on_tool_start(serialized, input_str, **kwargs)
+
+    def on_tool_end(
+        self,
+        output: Any,
+        color=None,
+        observation_prefix=None,
+        llm_prefix=None,
+        **kwargs: Any,
+    ) -> None:
+        with self._lock:
+            thought = self._tool_thoughts.pop(kwargs.get("run_id"), None)
+            thought = thought or self._require_current_thought()
+            if thought is self._current_thought:
+                self._current_thought = None
+            thought.on_tool_end(output, color, observation_prefix, llm_prefix, **kwargs)
+            thought.complete()
+            self._completed_thoughts.append(thought)
+
+    def on_tool_error(self, error: BaseException, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            thought = self._tool_thoughts.pop(kwargs.get("run_id"), None)
+            thought = thought or self._require_current_thought()
+            thought.on_tool_error(error, **kwargs)
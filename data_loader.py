@@ -1,5 +1,170 @@
+import io
+import os
+import re
+import json
+import hashlib
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from docx import Document
-from langchain_community.document_loaders import PyMuPDFLoader
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF < 1.24 only ships the fitz module
+    import fitz as pymupdf
+
+from cache import LRUCache, SingleFlight
+from workspace import WORKSPACE_MAX_AGE
+
+# Parsed resumes are personal data: they are only kept in memory, and no longer than the
+# session workspace holding the uploaded file
+RESUME_CACHE_TTL = int(os.environ.get("RESUME_CACHE_TTL", WORKSPACE_MAX_AGE))
+# Bump when the extraction changes so resumes parsed the old way are not reused
+RESUME_PARSER_VERSION = 3
+resume_text_memory = LRUCache(
+    maxsize=int(os.environ.get("RESUME_CACHE_SIZE", 32)), ttl=RESUME_CACHE_TTL
+)
+resume_single_flight = SingleFlight()
+
+# PDFs with at least this many pages are extracted by several processes
+RESUME_PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_PARALLEL_MIN_PAGES", 16))
+RESUME_PARSE_WORKERS = int(os.environ.get("RESUME_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+_page_executor = None
+
+# Canonical section name -> headings resumes commonly use for it
+RESUME_SECTIONS = {
+    "summary": r"summary|profile|professional summary|about me|objective|career objective",
+    "skills": r"skills|technical skills|core competencies|technologies|tech stack|tools",
+    "experience": r"experience|work experience|professional experience|employment(?: history)?|work history",
+    "projects": r"projects|personal projects|key projects",
+    "education": r"education|academic background|academics|qualifications",
+    "certifications": r"certifications?|licenses|courses",
+    "achievements": r"achievements|awards|honou?rs|accomplishments",
+    "publications": r"publications|papers|research",
+    "languages": r"languages",
+    "interests": r"interests|hobbies",
+}
+SECTION_HEADING = re.compile(
+    r"^\s*(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in RESUME_SECTIONS.items())
+    + r")\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _extract_page_range(file_path, start, stop):
+    # Runs in a worker process, PyMuPDF documents can't be shared between threads
+    with pymupdf.open(file_path) as pdf:
+        return [pdf[number].get_text() for number in range(start, stop)]
+
+
+def _worker_process_context():
+    # Forking the app, with its background loop, server threads and caches holding locks,
+    # can deadlock the children, workers are started from a clean process instead
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _get_page_executor():
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ProcessPoolExecutor(
+            max_workers=RESUME_PARSE_WORKERS, mp_context=_worker_process_context()
+        )
+    return _page_executor
+
+
+def extract_pdf_pages(file_path):
+    """
+    Extract the text of every page of a PDF with PyMuPDF.
+
+    Large PDFs are split into page ranges extracted in parallel by worker processes.
+
+    Returns:
+    list: The text of each page, in order.
+    """
+    with pymupdf.open(file_path) as pdf:
+        page_count = pdf.page_count
+        if page_count < RESUME_PARALLEL_MIN_PAGES or RESUME_PARSE_WORKERS < 2:
+            return [page.get_text() for page in pdf]
+
+    chunk_size = -(-page_count // RESUME_PARSE_WORKERS)
+    ranges = [
+        (start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+    executor = _get_page_executor()
+    futures = [
+        executor.submit(_extract_page_range, file_path, start, stop)
+        for start, stop in ranges
+    ]
+    return [text for future in futures for text in future.result()]
+
+
+def split_resume_sections(text, page_offsets=()):
+    """
+    Split resume text into sections at lines that look like section headings.
+
+    Parameters:
+    text (str): The text of the resume.
+    page_offsets (list): Character offset at which each page starts in the text.
+
+    Returns:
+    list: One dict per section with its canonical "name", the "heading" as written, its
+    "start"/"end" character offsets in the text, the "page" (1-based) it starts on and its
+    "text". Text before the first heading is returned as a "header" section.
+    """
+    headings = list(SECTION_HEADING.finditer(text))
+    # (heading start, body start, name, heading), the match also covers the blank lines and
+    # indentation before the heading and the colon after it
+    boundaries = [(0, 0, "header", "")] + [
+        (match.start(match.lastgroup), match.end(), match.lastgroup, match.group().strip())
+        for match in headings
+    ]
+    sections = []
+    for i, (start, body_start, name, heading) in enumerate(boundaries):
+        end = boundaries[i + 1][0] if i + 1 < len(boundaries) else len(text)
+        body = text[body_start:end].strip()
+        if not body and name == "header":
+            continue
+        page = sum(1 for offset in page_offsets if offset <= start) or 1
+        sections.append(
+            {
+                "name": name,
+                "heading": heading,
+                "start": start,
+                "end": end,
+                "page": page,
+                "text": body,
+            }
+        )
+    return sections
+
+
+def parse_resume(file_path):
+    """
+    Extract the text of a CV file along with its pages and sections.
+
+    Parameters:
+    file_path (str): The path to the CV file.
+
+    Returns:
+    dict: The plain "text", the "pages" as {"page", "start", "end"} character offsets into the
+    text, and the "sections" found by `split_resume_sections`.
+    """
+    page_texts = extract_pdf_pages(file_path)
+    pages = []
+    offset = 0
+    for number, page_text in enumerate(page_texts, start=1):
+        pages.append({"page": number, "start": offset, "end": offset + len(page_text)})
+        offset += len(page_text)
+    text = "".join(page_texts)
+    return {
+        "text": text,
+        "pages": pages,
+        "sections": split_resume_sections(text, [page["start"] for page in pages]),
+    }
 
 
 def load_resume(file_path):
@@ -12,12 +177,87 @@ def load_resume(file_path):
     Returns:
     str: The content of the CV file.
     """
-    loader = PyMuPDFLoader(file_path)
-    pages = loader.load()
-    page_content = ""
-    for page in pages:
-        page_content += page.page_content
-    return page_content
+    return parse_resume(file_path)["text"]
+
+
+def file_sha256(file_path) -> str:
+    """
+    Return the SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_resume_cached(file_path):
+    """
+    Parse a CV file with `parse_resume`, parsing each distinct file only once.
+
+    The result is cached in memory by the hash of the file content, so the same resume is
+    not parsed again by another tool call, a rerun or a new session.
+
+    Parameters:
+    file_path (str): The path to the CV file.
+
+    Returns:
+    dict: The text, pages and sections of the CV file.
+    """
+    key = f"v{RESUME_PARSER_VERSION}:{file_sha256(file_path)}"
+    resume = resume_text_memory.get(key)
+    if resume is None:
+        # Agents running in parallel wait for a single parse of the same file
+        resume = resume_single_flight.do(
+            key, lambda: _parse_resume_uncached(key, file_path)
+        )
+    return resume
+
+
+def _parse_resume_uncached(key, file_path):
+    resume = parse_resume(file_path)
+    resume_text_memory.set(key, resume)
+    return resume
+
+
+def load_resume_cached(file_path):
+    """
+    Load the content of a CV file through the parsed resume cache.
+
+    Parameters:
+    file_path (str): The path to the CV file.
+
+    Returns:
+    str: The content of the CV file.
+    """
+    return parse_resume_cached(file_path)["text"]
+
+
+# Optional .docx whose styles, header and footer every cover letter reuses
+COVER_LETTER_TEMPLATE_PATH = os.environ.get("COVER_LETTER_TEMPLATE_PATH")
+COVER_LETTER_RENDER_WORKERS = int(
+    os.environ.get("COVER_LETTER_RENDER_WORKERS", min(4, os.cpu_count() or 1))
+)
+_cover_letter_template = None
+_render_executor = None
+
+
+def load_cover_letter_template():
+    """
+    Return the bytes of the cover letter template document, read once per process.
+
+    Without COVER_LETTER_TEMPLATE_PATH the default python-docx template is used.
+    """
+    global _cover_letter_template
+    if _cover_letter_template is None:
+        if COVER_LETTER_TEMPLATE_PATH:
+            with open(COVER_LETTER_TEMPLATE_PATH, "rb") as f:
+                _cover_letter_template = f.read()
+        else:
+            buffer = io.BytesIO()
+            Document().save(buffer)
+            _cover_letter_template = buffer.getvalue()
+    return _cover_letter_template
 
 
 def write_cover_letter_to_doc(text, filename="temp/cover_letter.docx"):
@@ -31,7 +271,7 @@ def write_cover_letter_to_doc(text, filename="temp/cover_letter.docx"):
     Returns:
     str: The filename and path of the saved document.
     """
-    doc = Document()
+    doc = Document(io.BytesIO(load_cover_letter_template()))
     paragraphs = text.split("\n")
     # Add each paragraph to the document
     for para in paragraphs:
@@ -39,3 +279,55 @@ def write_cover_letter_to_doc(text, filename="temp/cover_letter.docx"):
     # Save the document to the specified file
     doc.save(filename)
     return filename
+
+
+def write_cover_letters_to_docs(letters):
+    """
+    Write several cover letters to Word documents, in a thread pool when there are enough
+    of them to pay for it.
+
+    Parameters:
+    letters (list): (text, filename) pairs.
+
+    Returns:
+    list: The filenames of the saved documents, in the order of the letters.
+    """
+    global _render_executor
+    if len(letters) < 3 or COVER_LETTER_RENDER_WORKERS < 2:
+        return [write_cover_letter_to_doc(text, filename) for text, filename in letters]
+
+    # Load the template once before the threads all need it
+    load_cover_letter_template()
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(max_workers=COVER_LETTER_RENDER_WORKERS)
+    return list(
+        _render_executor.map(
+            write_cover_letter_to_doc,
+            [text for text, _ in letters],
+            [filename for _, filename in letters],
+        )
+    )
+
+
+def write_cover_letter_bundle(manifest, output_dir):
+    """
+    Write the manifest of a batch of cover letters and zip it with the documents.
+
+    Parameters:
+    manifest (list): One dict per letter, with the "file" of the document when it was written.
+    output_dir (str): Directory of the documents, where the manifest and the zip are saved.
+
+    Returns:
+    str: The filename and path of the zip file.
+    """
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    zip_path = os.path.join(output_dir, "cover_letters.zip")
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.write(manifest_path, "manifest.json")
+        for entry in manifest:
+            if entry.get("file"):
+                bundle.write(entry["file"], os.path.basename(entry["file"]))
+    return zip_path
@@ -0,0 +1,126 @@
+import os
+import re
+import hashlib
+
+JOB_DEDUP_THRESHOLD = float(os.environ.get("JOB_DEDUP_THRESHOLD", 0.8))
+# Postings with the same title, company and location only need this much description overlap
+JOB_DEDUP_SAME_KEY_THRESHOLD = float(os.environ.get("JOB_DEDUP_SAME_KEY_THRESHOLD", 0.5))
+
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed coefficients so signatures are comparable across processes and runs
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big")
+        % (_MERSENNE_PRIME - 1)
+        + 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big")
+        % _MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase the text and reduce it to words separated by single spaces.
+    """
+    return " ".join(re.findall(r"[a-z0-9+#]+", (text or "").lower()))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Return the set of word n-grams of the normalized text.
+    """
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(shingle_set: set) -> list:
+    """
+    Compute the MinHash signature of a set of shingles.
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+        for s in shingle_set
+    ]
+    if not hashes:
+        return []
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(signature_a: list, signature_b: list) -> float:
+    """
+    Estimate the Jaccard similarity of two sets from their MinHash signatures.
+    """
+    if not signature_a or not signature_b:
+        return 0.0
+    matches = sum(a == b for a, b in zip(signature_a, signature_b))
+    return matches / len(signature_a)
+
+
+def _posting_key(job: dict) -> tuple:
+    return (
+        normalize_text(job.get("job_title")),
+        normalize_text(job.get("company_name")),
+        normalize_text(job.get("job_location")),
+    )
+
+
+def deduplicate_jobs(
+    jobs: list,
+    threshold: float = JOB_DEDUP_THRESHOLD,
+    same_key_threshold: float = JOB_DEDUP_SAME_KEY_THRESHOLD,
+):
+    """
+    Collapse reposts of the same job into the first (best ranked) posting.
+
+    Two postings are duplicates when their descriptions are at least `threshold` similar
+    (MinHash estimate of the Jaccard similarity of word shingles). Postings with the same
+    normalized title, company and location only need `same_key_threshold`, but their
+    descriptions are still compared: a company often has several distinct openings with the
+    same title in one city.
+
+    Args:
+        jobs (list): Job details as returned by `fetch_all_jobs`.
+        threshold (float): Minimum description similarity to treat two postings as one.
+        same_key_threshold (float): Minimum description similarity for postings with the
+            same title, company and location.
+
+    Returns:
+        tuple: The de-duplicated jobs in their original order, and a list of merges, each a dict
+        with the kept and dropped job titles/companies and their similarity.
+    """
+    signatures = [minhash_signature(shingles(job.get("job_desc_text"))) for job in jobs]
+    keys = [_posting_key(job) for job in jobs]
+
+    kept = []
+    merges = []
+    for i, job in enumerate(jobs):
+        duplicate_of, similarity = None, 0.0
+        for j in kept:
+            same_key = keys[i] == keys[j] and any(keys[i])
+            similarity = estimate_similarity(signatures[i], signatures[j])
+            if similarity >= (same_key_threshold if same_key else threshold):
+                duplicate_of = j
+                break
+
+        if duplicate_of is None:
+            kept.append(i)
+            continue
+        merges.append(
+            {
+                "kept": f"{jobs[duplicate_of].get('job_title')} @ {jobs[duplicate_of].get('company_name')}",
+                "dropped": f"{job.get('job_title')} @ {job.get('company_name')}",
+                "similarity": round(similarity, 2),
+            }
+        )
+
+    return [jobs[i] for i in kept], merges
@@ -0,0 +1,184 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from typing import Optional
+
+from cache import CACHE_DIR
+
+# Matches in the title count the most, the description the least
+COLUMN_WEIGHTS = {
+    "job_title": 10.0,
+    "company_name": 5.0,
+    "job_location": 2.0,
+    "job_desc_text": 1.0,
+}
+JOB_INDEX_MAX_AGE = int(os.environ.get("JOB_INDEX_MAX_AGE", 7 * 24 * 60 * 60))
+
+
+def _match_expression(text: str, operator: str) -> str:
+    # Quote every term so user input can't be read as FTS5 query syntax
+    terms = re.findall(r"\w+", text or "")
+    return f" {operator} ".join(f'"{term}"' for term in terms)
+
+
+class JobIndex:
+    """
+    A local full-text index of every job posting fetched so far, backed by SQLite FTS5.
+
+    Postings live in a regular table keyed by job id, an external-content FTS5 table kept in
+    sync by triggers indexes them. Jobs are ranked with BM25 over title, company, location and
+    description. The index lets repeated searches be answered without going to LinkedIn and
+    keeps search working while LinkedIn is throttling us.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.path.join(CACHE_DIR, "job_index.db")
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # "jobs" is the FTS5-only table of earlier versions, replacing a job in it scanned
+            # the whole index. Its postings are fetched again on the next searches.
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS jobs;
+                CREATE TABLE IF NOT EXISTS job_postings (
+                    id INTEGER PRIMARY KEY,
+                    job_id TEXT NOT NULL UNIQUE,
+                    job_title TEXT,
+                    company_name TEXT,
+                    job_location TEXT,
+                    job_desc_text TEXT,
+                    details TEXT,
+                    indexed_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS job_postings_indexed_at ON job_postings (indexed_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5(
+                    job_title, company_name, job_location, job_desc_text,
+                    content='job_postings', content_rowid='id', tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS job_postings_ai AFTER INSERT ON job_postings BEGIN
+                    INSERT INTO job_postings_fts (rowid, job_title, company_name, job_location, job_desc_text)
+                    VALUES (new.id, new.job_title, new.company_name, new.job_location, new.job_desc_text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_postings_ad AFTER DELETE ON job_postings BEGIN
+                    INSERT INTO job_postings_fts (job_postings_fts, rowid, job_title, company_name, job_location, job_desc_text)
+                    VALUES ('delete', old.id, old.job_title, old.company_name, old.job_location, old.job_desc_text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_postings_au AFTER UPDATE ON job_postings BEGIN
+                    INSERT INTO job_postings_fts (job_postings_fts, rowid, job_title, company_name, job_location, job_desc_text)
+                    VALUES ('delete', old.id, old.job_title, old.company_name, old.job_location, old.job_desc_text);
+                    INSERT INTO job_postings_fts (rowid, job_title, company_name, job_location, job_desc_text)
+                    VALUES (new.id, new.job_title, new.company_name, new.job_location, new.job_desc_text);
+                END;
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def add_many(self, jobs: dict) -> None:
+        """
+        Index the details of several jobs in one transaction, replacing earlier versions of them.
+
+        Postings older than JOB_INDEX_MAX_AGE, which searches no longer return, are deleted
+        in the same transaction.
+
+        Args:
+            jobs (dict): Job details keyed by job id.
+        """
+        if not jobs:
+            return
+        now = time.time()
+        rows = [
+            (
+                str(job_id),
+                job.get("job_title", ""),
+                job.get("company_name", ""),
+                job.get("job_location", ""),
+                job.get("job_desc_text", ""),
+                json.dumps(job),
+                now,
+            )
+            for job_id, job in jobs.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO job_postings (job_id, job_title, company_name, job_location, "
+                    "job_desc_text, details, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (job_id) DO UPDATE SET job_title = excluded.job_title, "
+                    "company_name = excluded.company_name, job_location = excluded.job_location, "
+                    "job_desc_text = excluded.job_desc_text, details = excluded.details, "
+                    "indexed_at = excluded.indexed_at",
+                    rows,
+                )
+                conn.execute(
+                    "DELETE FROM job_postings WHERE indexed_at <= ?", (now - JOB_INDEX_MAX_AGE,)
+                )
+
+    def add(self, job_id: str, job: dict) -> None:
+        """
+        Index the job details, replacing an earlier version of the same job.
+        """
+        self.add_many({job_id: job})
+
+    def _query(self, match: str, limit: int, max_age: int) -> list:
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS.values())
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT p.job_id, p.details, p.indexed_at FROM job_postings_fts "
+                f"JOIN job_postings p ON p.id = job_postings_fts.rowid "
+                f"WHERE job_postings_fts MATCH ? AND p.indexed_at > ? "
+                f"ORDER BY bm25(job_postings_fts, {weights}) LIMIT ?",
+                (match, time.time() - max_age, limit),
+            ).fetchall()
+        return rows
+
+    def search(
+        self,
+        keywords: str,
+        location_name: Optional[str] = None,
+        limit: int = 10,
+        max_age: int = JOB_INDEX_MAX_AGE,
+    ) -> list:
+        """
+        Search the indexed jobs.
+
+        Jobs matching all the keywords come first, jobs matching only some of them fill up the
+        remaining slots. A location, when given, has to match the job location.
+
+        Returns:
+            list: Job details, best match first, with the time they were indexed in "indexed_at".
+        """
+        keywords_all = _match_expression(keywords, "AND")
+        if not keywords_all:
+            return []
+        location = _match_expression(location_name, "AND")
+        location_filter = f" AND job_location : ({location})" if location else ""
+
+        rows = []
+        for keywords_match in (keywords_all, _match_expression(keywords, "OR")):
+            match = f"({keywords_match}){location_filter}"
+            rows.extend(self._query(match, limit, max_age))
+        job_ids = set()
+        jobs = []
+        for job_id, details, indexed_at in rows:
+            if job_id not in job_ids:
+                job_ids.add(job_id)
+                jobs.append({**json.loads(details), "indexed_at": indexed_at})
+        return jobs[:limit]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT count(*) FROM job_postings").fetchone()[0]
+
+
+job_index = JobIndex()
@@ -0,0 +1,95 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from linkedin_api import Linkedin
+
+LINKEDIN_POOL_SIZE = int(os.environ.get("LINKEDIN_POOL_SIZE", 4))
+LINKEDIN_COOKIES_DIR = os.environ.get(
+    "LINKEDIN_COOKIES_DIR", os.path.join(os.environ.get("CACHE_DIR", ".cache"), "linkedin")
+)
+
+
+class LinkedinClientPool:
+    """
+    A pool of authenticated `linkedin_api` clients shared by all searches of the process.
+
+    Only the first client logs in, its session cookies are persisted to `cookies_dir` and every
+    other client (including the ones created after a restart) is authenticated from them.
+    At most `size` clients exist, callers beyond that wait for one to be returned.
+    """
+
+    def __init__(
+        self, size: int = LINKEDIN_POOL_SIZE, cookies_dir: str = LINKEDIN_COOKIES_DIR
+    ) -> None:
+        self.size = size
+        self.cookies_dir = cookies_dir
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._login_lock = threading.Lock()
+
+    def _create_client(self, email: str, password: str) -> Linkedin:
+        os.makedirs(self.cookies_dir, exist_ok=True)
+        # One login at a time, the clients after the first one pick up its saved cookies
+        with self._login_lock:
+            return Linkedin(email, password, cookies_dir=self.cookies_dir + os.sep)
+
+    def _reset_if_credentials_changed(self, credentials: tuple) -> None:
+        with self._lock:
+            if self._credentials == credentials:
+                return
+            self._credentials = credentials
+            self._idle = queue.LifoQueue()
+            self._created = 0
+
+    def _acquire(self, idle: queue.LifoQueue, email: str, password: str) -> Linkedin:
+        while True:
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._create_client(email, password)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+            # Wake up now and then, a dropped client frees a slot without going back to the queue
+            try:
+                return idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def client(self):
+        """
+        Borrow an authenticated client, blocking until one is available.
+
+        A client whose call raised is dropped instead of being returned, so an expired or
+        challenged session is replaced by a fresh one on the next borrow.
+        """
+        email, password = os.getenv("LINKEDIN_EMAIL"), os.getenv("LINKEDIN_PASS")
+        self._reset_if_credentials_changed((email, password))
+        idle = self._idle
+
+        api = self._acquire(idle, email, password)
+        try:
+            yield api
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        else:
+            idle.put(api)
+
+
+linkedin_client_pool = LinkedinClientPool()
@@ -0,0 +1,238 @@
+import os
+import re
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml is in requirements, bs4 keeps working without it
+    lxml_html = None
+
+# Declarative description of a job posting page: field -> (tag, class tokens, attribute).
+# An attribute of None means the stripped text content of the element is used.
+# Class tokens are matched individually, so LinkedIn reordering or adding utility classes
+# doesn't break the extraction.
+JOB_DETAIL_SELECTORS = {
+    "job_title": ("h2", ("topcard__title",), None),
+    "job_location": ("span", ("topcard__flavor", "topcard__flavor--bullet"), None),
+    "company_name": ("a", ("topcard__org-name-link",), None),
+    "time_posted": ("span", ("posted-time-ago__text",), None),
+    "num_applicants": ("span", ("num-applicants__caption",), None),
+    "job_desc_text": ("div", ("decorated-job-posting__details",), None),
+    "apply_link": ("a", ("topcard__link",), "href"),
+}
+
+# Search result cards carry the job id in their urn, e.g. "urn:li:jobPosting:3901234567"
+JOB_CARD_SELECTOR = ("div", ("base-card",), "data-entity-urn")
+
+
+def _class_predicate(class_tokens):
+    return " and ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {token} ')"
+        for token in class_tokens
+    )
+
+
+def _element_text(element):
+    # Indentation between tags collapses to a single newline, the same text BeautifulSoup gives
+    return "".join(
+        text if text.strip() or "\n" not in text else "\n"
+        for text in element.itertext()
+    ).strip()
+
+
+def _has_classes(element, class_tokens):
+    element_classes = set((element.get("class") or "").split())
+    return all(token in element_classes for token in class_tokens)
+
+
+class LxmlJobParser:
+    """
+    Extracts job fields with lxml and XPath compiled once from the selector table.
+
+    All fields are pulled by a single union expression, so each page is parsed once and
+    walked once in C. Matches come back in document order and the first one per field wins,
+    which is what `BeautifulSoup.find` did.
+    """
+
+    def __init__(self, selectors: dict = JOB_DETAIL_SELECTORS) -> None:
+        self.selectors = selectors
+        self._xpath = etree.XPath(
+            " | ".join(
+                f"//{tag}[{_class_predicate(classes)}]"
+                for tag, classes, _ in selectors.values()
+            )
+        )
+        card_tag, card_classes, card_attribute = JOB_CARD_SELECTOR
+        self._card_xpath = etree.XPath(
+            f"//li//{card_tag}[{_class_predicate(card_classes)}]/@{card_attribute}"
+        )
+
+    def parse_job_details(self, html: str) -> dict:
+        job_post = {field: "" for field in self.selectors}
+        if not html.strip():
+            return job_post
+
+        found = set()
+        for element in self._xpath(lxml_html.fromstring(html)):
+            for field, (tag, classes, attribute) in self.selectors.items():
+                if field in found or element.tag != tag:
+                    continue
+                if not _has_classes(element, classes):
+                    continue
+                found.add(field)
+                if attribute:
+                    job_post[field] = element.get(attribute) or ""
+                else:
+                    job_post[field] = _element_text(element)
+        return job_post
+
+    def parse_job_ids(self, html: str) -> list:
+        if not html.strip():
+            return []
+        urns = self._card_xpath(lxml_html.fromstring(html))
+        return [urn.split(":")[3] for urn in urns]
+
+
+class SoupJobParser:
+    """
+    Extracts job fields with BeautifulSoup and the pure-Python `html.parser`.
+
+    This is the original extraction path, kept as a fallback when lxml isn't installed.
+    """
+
+    def __init__(self, selectors: dict = JOB_DETAIL_SELECTORS) -> None:
+        self.selectors = selectors
+
+    def parse_job_details(self, html: str) -> dict:
+        job_soup = BeautifulSoup(html, "html.parser")
+        job_post = {}
+        for field, (tag, classes, attribute) in self.selectors.items():
+            element = job_soup.select_one(tag + "".join(f".{c}" for c in classes))
+            if element is None:
+                job_post[field] = ""
+            elif attribute:
+                job_post[field] = element.get(attribute) or ""
+            else:
+                job_post[field] = element.text.strip()
+        return job_post
+
+    def parse_job_ids(self, html: str) -> list:
+        list_soup = BeautifulSoup(html, "html.parser")
+        card_tag, card_classes, card_attribute = JOB_CARD_SELECTOR
+        job_ids = []
+        for job in list_soup.find_all("li"):
+            base_card_div = job.find(card_tag, {"class": card_classes[0]})
+            job_ids.append(base_card_div.get(card_attribute).split(":")[3])
+        return job_ids
+
+
+PARSER_BACKENDS = {
+    "lxml": LxmlJobParser,
+    "bs4": SoupJobParser,
+}
+
+
+def get_job_parser(backend: str = None):
+    """
+    Return the HTML extraction backend selected by name or by the HTML_PARSER_BACKEND env variable.
+
+    Falls back to BeautifulSoup when lxml is not available.
+    """
+    backend = backend or os.environ.get("HTML_PARSER_BACKEND", "lxml")
+    if backend == "lxml" and lxml_html is None:
+        backend = "bs4"
+    return PARSER_BACKENDS[backend]()
+
+
+# Elements that never hold the main content of a page
+NON_CONTENT_TAGS = (
+    "script", "style", "noscript", "template", "svg", "iframe", "form", "button",
+    "nav", "header", "footer", "aside",
+)
+BOILERPLATE_HINT = re.compile(
+    r"comment|sidebar|footer|header|menu|navbar|banner|cookie|consent|popup|modal|"
+    r"share|social|related|advert|promo|breadcrumb|newsletter|subscribe",
+    re.IGNORECASE,
+)
+CONTENT_HINT = re.compile(r"article|content|main|post|entry|story|text|body", re.IGNORECASE)
+PARAGRAPH_TAGS = ("p", "pre", "li", "td", "blockquote")
+BLOCK_TAGS = PARAGRAPH_TAGS + (
+    "div", "section", "article", "main", "br", "tr", "ul", "ol", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+)
+# Paragraphs shorter than this are usually captions, buttons or link lists
+MIN_PARAGRAPH_CHARS = 25
+
+
+def _link_density(element) -> float:
+    text_length = len(element.text_content())
+    if not text_length:
+        return 1.0
+    link_length = sum(len(link.text_content()) for link in element.iter("a"))
+    return link_length / text_length
+
+
+def _block_text(element) -> str:
+    # Line breaks between block elements, collapsed whitespace inside them
+    for block in element.iter(*BLOCK_TAGS):
+        block.tail = "\n" + (block.tail or "")
+    lines = (" ".join(line.split()) for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def extract_main_content(html: str) -> dict:
+    """
+    Extract the title and the main text of a web page, readability style.
+
+    Navigation, scripts and elements whose class/id look like boilerplate are removed, then
+    every paragraph adds a score (based on its length and commas) to its parent and, at half
+    weight, its grandparent. The best scoring container, penalized by its link density, is
+    taken as the main content. Pages without paragraphs fall back to the whole body.
+
+    Returns:
+        dict: The page "title" and its main "text".
+    """
+    if lxml_html is None:
+        soup = BeautifulSoup(html, "html.parser")
+        for element in soup(list(NON_CONTENT_TAGS)):
+            element.decompose()
+        return {
+            "title": soup.title.get_text(strip=True) if soup.title else "",
+            "text": "\n".join(
+                line.strip() for line in soup.get_text("\n").splitlines() if line.strip()
+            ),
+        }
+
+    if not html.strip():
+        return {"title": "", "text": ""}
+    document = lxml_html.document_fromstring(html)
+    title = " ".join((document.findtext(".//title") or "").split())
+
+    for element in document.xpath(" | ".join(f"//{tag}" for tag in NON_CONTENT_TAGS)):
+        element.drop_tree()
+    for element in document.xpath("//body//*[@class or @id]"):
+        hints = f"{element.get('class', '')} {element.get('id', '')}"
+        if BOILERPLATE_HINT.search(hints) and not CONTENT_HINT.search(hints):
+            element.drop_tree()
+
+    scores = {}
+    for paragraph in document.iter(*PARAGRAPH_TAGS):
+        text = " ".join(paragraph.text_content().split())
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0) + score / 2
+
+    body = document.find("body")
+    best = max(
+        scores,
+        key=lambda element: scores[element] * (1 - _link_density(element)),
+        default=body if body is not None else document,
+    )
+    return {"title": title, "text": _block_text(best)}
@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+# Fields of a job posting that describe what the job is about, the title counts twice
+JOB_TEXT_FIELDS = ("job_title", "job_title", "company_name", "job_desc_text")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this "
+    "to we will with you your they their who what which about into than then also"
+    .split()
+)
+
+
+def tokenize(text: str) -> list:
+    """
+    Split the text into lowercase word tokens without stop words.
+    """
+    return [
+        token
+        for token in re.findall(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]", (text or "").lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def job_to_text(job: dict) -> str:
+    return " ".join(str(job.get(field) or "") for field in JOB_TEXT_FIELDS)
+
+
+def tfidf_matrix(documents: list) -> np.ndarray:
+    """
+    Build the L2-normalized TF-IDF matrix of the documents, one row per document.
+    """
+    token_counts = [Counter(tokenize(document)) for document in documents]
+    vocabulary = {
+        token: i
+        for i, token in enumerate(sorted(set().union(*token_counts)))
+    }
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, counts in enumerate(token_counts):
+        if counts:
+            columns = [vocabulary[token] for token in counts]
+            matrix[row, columns] = list(counts.values())
+
+    # Sublinear term frequency, so a word repeated in the boilerplate doesn't dominate
+    np.log1p(matrix, out=matrix)
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    matrix *= idf.astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def rank_jobs(jobs: list, resume_text: str, top_k: int = None) -> list:
+    """
+    Rank job postings by their TF-IDF cosine similarity to the resume.
+
+    All postings are scored in one matrix product against the resume vector.
+
+    Args:
+        jobs (list): Job details as returned by the job search.
+        resume_text (str): Plain text of the resume.
+        top_k (int, optional): Number of best matching jobs to return, all of them by default.
+
+    Returns:
+        list: (score, job) tuples, best match first.
+    """
+    if not jobs or not (resume_text or "").strip():
+        return [(0.0, job) for job in jobs][:top_k]
+
+    matrix = tfidf_matrix([resume_text] + [job_to_text(job) for job in jobs])
+    scores = matrix[1:] @ matrix[0]
+    # Stable sort keeps LinkedIn's order between jobs with the same score
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return [(float(scores[i]), jobs[i]) for i in order]
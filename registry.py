@@ -0,0 +1,69 @@
+import os
+import json
+import hashlib
+from typing import Any, Callable, Hashable
+
+from cache import LRUCache, SingleFlight
+
+# Components of configs unused for this long are dropped and rebuilt on their next use
+COMPONENT_IDLE_TTL = int(os.environ.get("COMPONENT_IDLE_TTL", 30 * 60))
+COMPONENT_REGISTRY_SIZE = int(os.environ.get("COMPONENT_REGISTRY_SIZE", 64))
+
+
+def config_key(config: dict) -> str:
+    """
+    Return a stable key for a model config.
+
+    The API key of the provider is read from the environment when the client is built, so a
+    fingerprint of it is part of the key: a new key gets a new client.
+    """
+    provider = (config.get("model_provider") or "").upper()
+    api_key = os.environ.get(f"{provider}_API_KEY", "")
+    return json.dumps(
+        {
+            **config,
+            "api_key_sha256": hashlib.sha256(api_key.encode()).hexdigest()[:16],
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+class ComponentRegistry:
+    """
+    Builds expensive components (chat model clients, chains, agent executors) once per key
+    and reuses them across graph nodes, requests and sessions.
+
+    Entries are kept for the `maxsize` most recently used keys and dropped after `idle_ttl`
+    seconds without use. Concurrent first uses of a key build the component only once.
+    """
+
+    def __init__(
+        self, maxsize: int = COMPONENT_REGISTRY_SIZE, idle_ttl: int = COMPONENT_IDLE_TTL
+    ) -> None:
+        self._components = LRUCache(maxsize=maxsize, ttl=idle_ttl)
+        self._single_flight = SingleFlight()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        component = self._components.get(key)
+        if component is None:
+            component = self._single_flight.do(key, lambda: self._build(key, factory))
+        else:
+            self.hits += 1
+        # Refresh the expiry, only idle components are evicted
+        self._components.set(key, component)
+        return component
+
+    def _build(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        component = factory()
+        self.builds += 1
+        self._components.set(key, component)
+        return component
+
+    def stats(self) -> dict:
+        return {"size": len(self._components), "builds": self.builds, "hits": self.hits}
+
+
+component_registry = ComponentRegistry()
@@ -0,0 +1,139 @@
+import os
+import re
+import datetime
+
+from compaction import truncate_to_tokens
+from data_loader import parse_resume_cached
+
+# Resume text included in the profile message, the agents don't need the whole document
+RESUME_PROFILE_TEXT_TOKENS = int(os.environ.get("RESUME_PROFILE_TEXT_TOKENS", 1500))
+MAX_PROFILE_SKILLS = 30
+MAX_PROFILE_TITLES = 5
+
+# Used when the resume has no skills section
+SKILL_VOCABULARY = (
+    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#", "sql", "scala",
+    "react", "node.js", "django", "flask", "fastapi", "spring", "pytorch", "tensorflow",
+    "keras", "scikit-learn", "pandas", "numpy", "spark", "hadoop", "kafka", "airflow",
+    "docker", "kubernetes", "terraform", "aws", "azure", "gcp", "postgresql", "mysql",
+    "mongodb", "redis", "elasticsearch", "langchain", "langgraph", "llm", "nlp",
+    "computer vision", "machine learning", "deep learning", "generative ai", "rag",
+    "mlops", "data engineering", "data analysis", "tableau", "power bi", "git", "linux",
+)
+SKILL_PATTERN = re.compile(
+    r"(?<![\w+#.])(" + "|".join(re.escape(skill) for skill in SKILL_VOCABULARY) + r")(?![\w+#])",
+    re.IGNORECASE,
+)
+SKILL_SEPARATORS = re.compile(r"[,;|•·▪●\n]|\s-\s|\s{2,}")
+TITLE_PATTERN = re.compile(
+    r"\b((?:senior|junior|lead|principal|staff|associate|chief|head of|sr\.?|jr\.?)?\s*"
+    r"[\w/&+. -]{0,40}?\b(?:engineer|developer|scientist|analyst|architect|manager|consultant|"
+    r"designer|researcher|intern|administrator|specialist|director|lead))\b",
+    re.IGNORECASE,
+)
+YEARS_STATED = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+YEAR_RANGE = re.compile(
+    r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|till date|date)",
+    re.IGNORECASE,
+)
+
+
+def _sections_text(resume: dict, name: str) -> str:
+    return "\n".join(
+        section["text"] for section in resume["sections"] if section["name"] == name
+    )
+
+
+def extract_skills(resume: dict) -> list:
+    """
+    Return the skills listed in the skills section, or known skills found in the whole text.
+    """
+    skills_text = _sections_text(resume, "skills")
+    if skills_text:
+        candidates = [
+            part.split(":", 1)[-1].strip(" .\t")
+            for part in SKILL_SEPARATORS.split(skills_text)
+        ]
+    else:
+        candidates = [match.group(1) for match in SKILL_PATTERN.finditer(resume["text"])]
+
+    skills = {}
+    for skill in candidates:
+        if skill and len(skill) <= 40:
+            skills.setdefault(skill.lower(), skill)
+    return list(skills.values())[:MAX_PROFILE_SKILLS]
+
+
+def extract_titles(resume: dict) -> list:
+    """
+    Return the job titles mentioned in the experience section, most recent (first listed) first.
+    """
+    experience_text = _sections_text(resume, "experience") or resume["text"]
+    titles = {}
+    for line in experience_text.splitlines():
+        match = TITLE_PATTERN.search(line)
+        if match:
+            title = " ".join(match.group(1).split())
+            titles.setdefault(title.lower(), title)
+    return list(titles.values())[:MAX_PROFILE_TITLES]
+
+
+def estimate_years_of_experience(resume: dict) -> int:
+    """
+    Estimate the years of experience from the date ranges of the experience section, or from
+    an explicit "N years" statement when there are no dates.
+    """
+    experience_text = _sections_text(resume, "experience")
+    current_year = datetime.date.today().year
+    ranges = []
+    for start, end in YEAR_RANGE.findall(experience_text):
+        end_year = int(end) if end.isdigit() else current_year
+        if int(start) <= end_year <= current_year:
+            ranges.append((int(start), end_year))
+    if ranges:
+        return max(end for _, end in ranges) - min(start for start, _ in ranges)
+
+    stated = [int(years) for years in YEARS_STATED.findall(resume["text"])]
+    return max(stated) if stated else None
+
+
+def build_resume_profile(file_path: str) -> dict:
+    """
+    Build the profile of a resume: its text plus the skills, titles and years of experience.
+
+    Built from the cached structured parse, so it is cheap to call again for the same file.
+    """
+    resume = parse_resume_cached(file_path)
+    return {
+        "text": resume["text"],
+        "skills": extract_skills(resume),
+        "titles": extract_titles(resume),
+        "years_of_experience": estimate_years_of_experience(resume),
+    }
+
+
+def format_resume_profile(profile: dict, max_tokens: int = RESUME_PROFILE_TEXT_TOKENS) -> str:
+    """
+    Render the profile as the message given to the agents in place of a ResumeExtractor call.
+    """
+    years = profile.get("years_of_experience")
+    return "\n".join(
+        [
+            "Candidate resume profile (already extracted from the uploaded resume, "
+            "no need to call ResumeExtractor):",
+            f"- Skills: {', '.join(profile.get('skills') or []) or 'unknown'}",
+            f"- Recent titles: {', '.join(profile.get('titles') or []) or 'unknown'}",
+            f"- Years of experience: {years if years is not None else 'unknown'}",
+            "",
+            "Resume text:",
+            truncate_to_tokens(profile.get("text", ""), max_tokens),
+        ]
+    )
+
+
+def resume_ranking_text(profile: dict) -> str:
+    """
+    Text to rank jobs against: titles and skills are repeated so they outweigh the rest.
+    """
+    emphasis = " ".join((profile.get("titles") or []) + (profile.get("skills") or []))
+    return "\n".join([emphasis, emphasis, profile.get("text", "")])
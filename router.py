@@ -0,0 +1,125 @@
+import os
+import re
+import logging
+import threading
+from collections import Counter
+from typing import Optional
+
+from langchain_core.messages import BaseMessage
+
+# Set FAST_ROUTER=false to send every routing decision to the supervisor LLM
+FAST_ROUTER_ENABLED = os.environ.get("FAST_ROUTER", "true").lower() not in ("0", "false", "no")
+
+# The routing stats are logged every this many decisions
+ROUTER_STATS_LOG_EVERY = int(os.environ.get("ROUTER_STATS_LOG_EVERY", 50))
+
+logger = logging.getLogger(__name__)
+
+WORKERS = ("ResumeAnalyzer", "CoverLetterGenerator", "JobSearcher", "WebResearcher", "ChatBot")
+
+# Worker -> what a request for it looks like. Only unambiguous phrasings belong here,
+# anything else is left to the supervisor LLM.
+INTENT_RULES = {
+    "CoverLetterGenerator": re.compile(
+        r"\b(write|generate|create|draft|prepare|make)\b.{0,30}\bcover[- ]?letters?\b",
+        re.IGNORECASE,
+    ),
+    "ResumeAnalyzer": re.compile(
+        r"\b(summari[sz]e|analy[sz]e|review|evaluate|assess|extract)\b"
+        r".{0,30}\b(my )?(resume|cv)\b",
+        re.IGNORECASE,
+    ),
+    # A search verb followed by a job noun
+    "JobSearcher": re.compile(
+        r"\b(find|search(ing)?|look(ing)? for|show|list)\b"
+        r".{0,40}\b(jobs?|job listings?|job postings?|openings?|vacanc(y|ies)|internships?)\b",
+        re.IGNORECASE,
+    ),
+    # "research"/"google" only as a command, "research roles" is about something else
+    "WebResearcher": re.compile(
+        r"(^\s*|\b(and|then|also) )(research|google)\b|"
+        r"\b(search the web|web search|news|trends?|emerging technolog(y|ies))\b",
+        re.IGNORECASE,
+    ),
+}
+# Questions about a worker's subject ("Should I write a cover letter?") are not requests
+# for it, they are left to the supervisor LLM
+QUESTION = re.compile(r"\b(how|why|should|what)\b", re.IGNORECASE)
+
+
+class RouterStats:
+    """
+    Counters of how routing decisions were made: by the fast path or by the LLM.
+
+    A snapshot is logged every ROUTER_STATS_LOG_EVERY decisions, for operators.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+            decisions = sum(self.counts.values())
+        if ROUTER_STATS_LOG_EVERY and decisions % ROUTER_STATS_LOG_EVERY == 0:
+            logger.info("Routing stats -> %s", self.snapshot())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        fast = sum(value for key, value in counts.items() if key.startswith("fast:"))
+        total = fast + counts.get("llm", 0)
+        return {
+            **counts,
+            "decisions": total,
+            "fast_path_hit_rate": fast / total if total else 0.0,
+        }
+
+
+router_stats = RouterStats()
+
+
+def classify_intents(text: str) -> set:
+    """
+    Return the workers the request explicitly asks for.
+    """
+    if QUESTION.search(text or ""):
+        return set()
+    return {worker for worker, pattern in INTENT_RULES.items() if pattern.search(text or "")}
+
+
+def _author(message) -> Optional[str]:
+    # The user's messages are plain strings or unnamed human messages
+    if isinstance(message, BaseMessage) and message.name in WORKERS:
+        return message.name
+    return None
+
+
+def fast_route(state) -> Optional[str]:
+    """
+    Resolve the next step without the LLM when the request has exactly one clear intent.
+
+    Returns the worker to run when none has answered the latest user input yet, "Finish"
+    once exactly that worker has answered, and None (let the LLM decide) otherwise.
+    """
+    if not FAST_ROUTER_ENABLED:
+        return None
+
+    intents = classify_intents(state.get("user_input", ""))
+    if not intents:
+        return None
+
+    answered = []
+    for message in reversed(state.get("messages", [])):
+        author = _author(message)
+        if author is None:
+            break
+        answered.append(author)
+
+    if not answered and len(intents) == 1:
+        return next(iter(intents))
+    # Answers of workers run in parallel still have to be merged, that is left to the LLM
+    if len(answered) == 1 and answered == list(intents):
+        return "Finish"
+    return None
@@ -16,6 +16,18 @@ class RouteSchema(BaseModel):
         title="Next",
         description="Select the next role",
     )
+    parallel_actions: List[
+        Literal[
+            "ResumeAnalyzer",
+            "CoverLetterGenerator",
+            "JobSearcher",
+            "WebResearcher",
+        ]
+    ] = Field(
+        default_factory=list,
+        title="Parallel",
+        description="Other roles to run at the same time as next_action, only when their tasks don't depend on each other's results. Leave empty otherwise.",
+    )
 
 
 class JobSearchInput(BaseModel):
@@ -66,3 +78,23 @@ class JobSearchInput(BaseModel):
         default=25,
         description="Maximum distance from location in miles. If not specified or 0, the default value of 25 miles is applied.",
     )
+
+
+class JobBatchSearchInput(BaseModel):
+    searches: List[JobSearchInput] = Field(
+        description="Several job searches to run at once, e.g. the same role in different locations or different titles in one location."
+    )
+
+
+class CoverLetterJob(BaseModel):
+    company_name: str = Field(description="Name of the company.")
+    job_title: str = Field(description="Title of the job.")
+    job_description: Optional[str] = Field(
+        default="", description="Description or summary of the job, as found by the job search."
+    )
+
+
+class CoverLetterBatchInput(BaseModel):
+    jobs: List[CoverLetterJob] = Field(
+        description="The jobs to write a cover letter for, one letter per job."
+    )
@@ -2,11 +2,17 @@ import aiohttp
 import os
 import urllib
 import asyncio
-import requests
+import random
+import time
+import hashlib
+import itertools
 from typing import List, Literal, Union, Optional
-from asgiref.sync import sync_to_async
-from linkedin_api import Linkedin
-from bs4 import BeautifulSoup
+from async_runner import get_http_session, run_async
+from cache import CACHE_DIR, TTLCache
+from dedupe import JOB_DEDUP_THRESHOLD, deduplicate_jobs
+from job_index import JOB_INDEX_MAX_AGE, JobIndex, job_index as linkedin_job_index
+from linkedin_pool import linkedin_client_pool
+from parsers import get_job_parser
 
 employment_type_mapping = {
     "full-time": "F",
@@ -33,6 +39,37 @@ job_type_mapping = {
     "hybrid": "3",
 }
 
+# Point this at benchmarks/linkedin_stub_server.py to exercise the guest search without linkedin.com
+DEFAULT_LINKEDIN_BASE_URL = "https://www.linkedin.com"
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", DEFAULT_LINKEDIN_BASE_URL).rstrip("/")
+
+# The guest search endpoint answers with an empty page without a browser user agent
+LINKEDIN_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Responses worth retrying, LinkedIn answers 429 as soon as we go too fast
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Parses every search and job posting page, see parsers.PARSER_BACKENDS
+job_parser = get_job_parser()
+
+# Job details are shared between sessions, popular searches return the same postings again and again
+job_details_cache = TTLCache(
+    "job_details", ttl=int(os.environ.get("JOB_CACHE_TTL", 6 * 60 * 60))
+)
+# Postings from another server (e.g. the stub) are cached and indexed apart from LinkedIn's,
+# their ids overlap with real ones
+if LINKEDIN_BASE_URL == DEFAULT_LINKEDIN_BASE_URL:
+    job_index = linkedin_job_index
+else:
+    job_index = JobIndex(
+        os.path.join(
+            CACHE_DIR,
+            f"job_index-{hashlib.sha1(LINKEDIN_BASE_URL.encode()).hexdigest()[:12]}.db",
+        )
+    )
+# Fetched jobs are written to the cache and the index this many at a time
+JOB_STORE_BATCH_SIZE = int(os.environ.get("JOB_STORE_BATCH_SIZE", 10))
+
 
 def build_linkedin_job_url(
     keywords,
@@ -42,11 +79,12 @@ def build_linkedin_job_url(
     job_type=None,
     start=10,
 ):
-    base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search/"
+    base_url = f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/seeMoreJobPostings/search/"
 
     # Prepare query parameters
     query_params = {
         "keywords": keywords,
+        "start": start,
     }
 
     if location:
@@ -109,17 +147,17 @@ def get_job_ids_from_linkedin_api(
         experience_level = validate_job_search_params(
             experience, experience_type_mapping
         )
-        api = Linkedin(os.getenv("LINKEDIN_EMAIL"), os.getenv("LINKEDIN_PASS"))
-        job_postings = api.search_jobs(
-            keywords=keywords,
-            job_type=employment_type,
-            location_name=location_name,
-            remote=job_type,
-            limit=limit,
-            experience=experience_level,
-            listed_at=listed_at,
-            distance=distance,
-        )
+        with linkedin_client_pool.client() as api:
+            job_postings = api.search_jobs(
+                keywords=keywords,
+                job_type=employment_type,
+                location_name=location_name,
+                remote=job_type,
+                limit=limit,
+                experience=experience_level,
+                listed_at=listed_at,
+                distance=distance,
+            )
         # Extracting just the part after "jobPosting:" from the trackingUrn and the title using list comprehension
         job_ids = [job["trackingUrn"].split("jobPosting:")[1] for job in job_postings]
         return job_ids
@@ -175,122 +213,183 @@ def get_job_ids(
         )
 
     try:
-        # Construct the URL for LinkedIn job search
-        job_url = build_linkedin_job_url(
-            keywords=keywords,
-            location=location_name,
-            employment_type=employment_type,
-            experience_level=experience,
-            job_type=job_type,
-        )
-
-        # Send a GET request to the URL and store the response
-        response = requests.get(
-            job_url, timeout=30, headers={"User-Agent": "Mozilla/5.0"}
+        return run_async(
+            get_job_ids_async(
+                keywords=keywords,
+                location_name=location_name,
+                employment_type=employment_type,
+                limit=limit,
+                job_type=job_type,
+                experience=experience,
+                listed_at=listed_at,
+                distance=distance,
+            )
         )
-
-        # Get the HTML, parse the response and find all list items(jobs postings)
-        list_data = response.text
-        list_soup = BeautifulSoup(list_data, "html.parser")
-        page_jobs = list_soup.find_all("li")
-
-        # Create an empty list to store the job postings
-        job_ids = []
-        # Itetrate through job postings to find job ids
-        for job in page_jobs:
-            base_card_div = job.find("div", {"class": "base-card"})
-            job_id = base_card_div.get("data-entity-urn").split(":")[3]
-            job_ids.append(job_id)
-        return job_ids
     except Exception as e:
         print(f"Error in fetching job ids from LinkedIn -> {e}")
     return []
 
 
-async def fetch_job_details(session, job_id):
-    # Construct the URL for each job using the job ID
-    job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-
-    # Send a GET request to the job URL
-    async with session.get(job_url) as response:
-        job_soup = BeautifulSoup(await response.text(), "html.parser")
+async def get_job_ids_async(
+    keywords: str,
+    location_name: str = None,
+    employment_type=None,
+    limit: Optional[int] = 10,
+    job_type=None,
+    experience=None,
+    listed_at: Optional[Union[int, str]] = 86400,
+    distance=None,
+):
+    """
+    Async counterpart of `get_job_ids`, several searches can run concurrently on one loop.
+    """
+    if os.environ.get("LINKEDIN_SEARCH") == "linkedin_api":
+        return await asyncio.to_thread(
+            get_job_ids_from_linkedin_api,
+            keywords=keywords,
+            location_name=location_name,
+            employment_type=employment_type,
+            limit=limit,
+            job_type=job_type,
+            experience=experience,
+            listed_at=listed_at,
+            distance=distance,
+        )
 
-        # Create a dictionary to store job details
-        job_post = {}
+    job_ids = []
+    async for page_ids in iter_job_ids(
+        keywords=keywords,
+        location_name=location_name,
+        employment_type=employment_type,
+        limit=limit,
+        job_type=job_type,
+        experience=experience,
+    ):
+        job_ids.extend(page_ids)
+    return job_ids
 
-        # Try to extract and store the job title
-        try:
-            job_post["job_title"] = job_soup.find(
-                "h2",
-                {
-                    "class": "top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"
-                },
-            ).text.strip()
-        except Exception as exc:
-            job_post["job_title"] = ""
 
+async def iter_job_ids(
+    keywords: str,
+    location_name: str = None,
+    employment_type=None,
+    limit: Optional[int] = 10,
+    job_type=None,
+    experience=None,
+):
+    """
+    Walk the LinkedIn guest search result pages and yield the new job ids of each page.
+
+    Stops once `limit` ids were yielded or LinkedIn runs out of results.
+    """
+    limit = limit or 10
+    session = get_http_session()
+    seen = set()
+    start = 0
+    while len(seen) < limit:
+        # Construct the URL for LinkedIn job search
+        job_url = build_linkedin_job_url(
+            keywords=keywords,
+            location=location_name,
+            employment_type=employment_type,
+            experience_level=experience,
+            job_type=job_type,
+            start=start,
+        )
         try:
-            job_post["job_location"] = job_soup.find(
-                "span",
-                {"class": "topcard__flavor topcard__flavor--bullet"},
-            ).text.strip()
-        except Exception as exc:
-            job_post["job_location"] = ""
-
-        # Try to extract and store the company name
+            html = await fetch_with_retries(session, job_url, headers=LINKEDIN_HEADERS)
+        except Exception as e:
+            print(f"Error in fetching job ids from LinkedIn -> {e}")
+            return
+
+        # Get the HTML and pull the job ids out of the job posting cards
+        page_ids = job_parser.parse_job_ids(html)
+        new_ids = [job_id for job_id in page_ids if job_id not in seen]
+        if not new_ids:
+            return
+        new_ids = new_ids[: limit - len(seen)]
+        seen.update(new_ids)
+        yield new_ids
+        start += len(page_ids)
+
+
+def parse_job_details(html):
+    try:
+        return job_parser.parse_job_details(html)
+    except Exception as exc:
+        print(f"Error in parsing job details -> {exc}")
+    return job_parser.parse_job_details("")
+
+
+async def fetch_with_retries(
+    session,
+    url,
+    headers=None,
+    timeout=float(os.environ.get("JOB_FETCH_TIMEOUT", 15)),
+    max_retries=int(os.environ.get("JOB_FETCH_RETRIES", 3)),
+    backoff_base=float(os.environ.get("JOB_FETCH_BACKOFF", 1.0)),
+    max_backoff=float(os.environ.get("JOB_FETCH_MAX_BACKOFF", 30.0)),
+):
+    """
+    GET the url and return the response body, retrying throttled and failed requests.
+
+    429 and 5xx responses, connection errors and timeouts are retried with exponential
+    backoff and full jitter. A Retry-After header from LinkedIn takes precedence over the
+    computed delay. Every delay is capped at `max_backoff` seconds so a huge Retry-After
+    can't hang the tool call. Raises the last error once all retries are used up.
+    """
+    for attempt in range(max_retries + 1):
+        retry_after = None
         try:
-            job_post["company_name"] = job_soup.find(
-                "a", {"class": "topcard__org-name-link topcard__flavor--black-link"}
-            ).text.strip()
-        except Exception as exc:
-            job_post["company_name"] = ""
+            async with session.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return await response.text()
+                retry_after = response.headers.get("Retry-After")
+                error = aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=response.reason or "",
+                )
+        except aiohttp.ClientResponseError:
+            # 4xx other than 429 won't get better by asking again
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            error = exc
+
+        if attempt == max_retries:
+            raise error
+
+        delay = random.uniform(0, backoff_base * 2**attempt)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        await asyncio.sleep(min(delay, max_backoff))
 
-        # Try to extract and store the time posted
-        try:
-            job_post["time_posted"] = job_soup.find(
-                "span", {"class": "posted-time-ago__text topcard__flavor--metadata"}
-            ).text.strip()
-        except Exception as exc:
-            job_post["time_posted"] = ""
 
-        # Try to extract and store the number of applicants
-        try:
-            job_post["num_applicants"] = job_soup.find(
-                "span",
-                {
-                    "class": "num-applicants__caption topcard__flavor--metadata topcard__flavor--bullet"
-                },
-            ).text.strip()
-        except Exception as exc:
-            job_post["num_applicants"] = ""
+async def fetch_job_details(session, job_id):
+    # Construct the URL for each job using the job ID
+    job_url = f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/jobPosting/{job_id}"
 
-        # Try to extract and store the job description
-        try:
-            job_description = job_soup.find(
-                "div", {"class": "decorated-job-posting__details"}
-            ).text.strip()
-            job_post["job_desc_text"] = job_description
-        except Exception as exc:
-            job_post["job_desc_text"] = ""
+    try:
+        html = await fetch_with_retries(session, job_url)
+    except Exception as exc:
+        print(f"Error in fetching job {job_id} -> {exc}")
+        html = ""
+    return parse_job_details(html)
 
-        try:
-            # Try to extract and store the apply link
-            apply_link_tag = job_soup.find("a", class_="topcard__link")
-            if apply_link_tag:
-                apply_link = apply_link_tag.get("href")
-                job_post["apply_link"] = apply_link
-        except Exception as exc:
-            job_post["apply_link"] = ""
 
-        return job_post
+def _get_job_from_linkedin_api(job_id):
+    with linkedin_client_pool.client() as api:
+        return api.get_job(job_id)
 
 
 async def get_job_details_from_linkedin_api(job_id):
     try:
-        api = Linkedin(os.getenv("LINKEDIN_EMAIL"), os.getenv("LINKEDIN_PASS"))
-        job_data = await sync_to_async(api.get_job)(
-            job_id
-        )  # Assuming this function is async and fetches job data
+        # The client is blocking, run it in a worker thread with a pooled, already logged in client
+        job_data = await asyncio.to_thread(_get_job_from_linkedin_api, job_id)
 
         # Construct the job data dictionary with defaults
         job_data_dict = {
@@ -331,25 +430,306 @@ async def get_job_details_from_linkedin_api(job_id):
     return job_data_dict
 
 
-async def fetch_all_jobs(job_ids, batch_size=5):
-    results = []
+def _job_cache_key(job_id):
+    # Both search modes return differently shaped details, keep them apart
+    search_mode = os.environ.get("LINKEDIN_SEARCH") or "guest"
+    if search_mode == "guest" and LINKEDIN_BASE_URL != DEFAULT_LINKEDIN_BASE_URL:
+        search_mode = f"guest@{LINKEDIN_BASE_URL}"
+    return f"{search_mode}:{job_id}"
+
 
+def store_jobs(jobs):
+    """
+    Save fetched job details to the details cache and the local job index in one write each.
+
+    Args:
+        jobs (dict): Job details keyed by job id.
+    """
     try:
-        if os.environ.get("LINKEDIN_SEARCH") == "linkedin_api":
-            return await asyncio.gather(
-                *[get_job_details_from_linkedin_api(job_id) for job_id in job_ids]
-            )
+        job_details_cache.set_many(
+            {_job_cache_key(job_id): job for job_id, job in jobs.items()}
+        )
+        job_index.add_many(jobs)
+    except Exception as exc:
+        print(f"Error in storing {len(jobs)} jobs -> {exc}")
 
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for job_id in job_ids:
-                task = asyncio.create_task(fetch_job_details(session, job_id))
-                tasks.append(task)
 
-            # Await the completion of all tasks
-            results = await asyncio.gather(*tasks)
-            return results
+async def iter_job_details(
+    job_ids,
+    concurrency=int(os.environ.get("JOB_FETCH_CONCURRENCY", 5)),
+    semaphore=None,
+):
+    """
+    Fetch details for the job ids and yield (job_id, job_details) pairs as soon as each one is ready.
+
+    Cached jobs are yielded first, the rest are fetched with at most `concurrency` requests in flight.
+    Callers running several of these at once pass a shared `semaphore` to cap them together.
+    Results therefore do not come back in the order of `job_ids`.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    cached = await asyncio.to_thread(
+        job_details_cache.get_many, [_job_cache_key(job_id) for job_id in job_ids]
+    )
+    missing_ids = []
+    for job_id in job_ids:
+        if _job_cache_key(job_id) in cached:
+            yield job_id, cached[_job_cache_key(job_id)]
+        else:
+            missing_ids.append(job_id)
+    if not missing_ids:
+        return
+
+    semaphore = semaphore or asyncio.Semaphore(max(1, concurrency))
+    use_linkedin_api = os.environ.get("LINKEDIN_SEARCH") == "linkedin_api"
+
+    async def fetch_one(session, job_id):
+        async with semaphore:
+            if use_linkedin_api:
+                job = await get_job_details_from_linkedin_api(job_id)
+            else:
+                job = await fetch_job_details(session, job_id)
+        return job_id, job
+
+    # Fetched jobs are stored in batches on a worker thread, SQLite writes would stall the loop
+    to_store = {}
+    store_tasks = []
+
+    def flush_stored_jobs():
+        if to_store:
+            batch = dict(to_store)
+            to_store.clear()
+            store_tasks.append(asyncio.create_task(asyncio.to_thread(store_jobs, batch)))
+
+    session = get_http_session()
+    tasks = [asyncio.create_task(fetch_one(session, job_id)) for job_id in missing_ids]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            job_id, job = await next_done
+            # Failed fetches come back without a title or description, don't keep them around
+            if job.get("job_title") or job.get("job_desc_text"):
+                to_store[job_id] = job
+                if len(to_store) >= JOB_STORE_BATCH_SIZE:
+                    flush_stored_jobs()
+            yield job_id, job
+    finally:
+        # The consumer may stop early, don't leave requests running behind its back
+        for task in tasks:
+            task.cancel()
+        flush_stored_jobs()
+        await asyncio.gather(*store_tasks)
+
+
+async def fetch_all_jobs(
+    job_ids, batch_size=int(os.environ.get("JOB_FETCH_CONCURRENCY", 5))
+):
+    """
+    Fetch details for all the job ids, `batch_size` requests at a time.
+
+    Returns:
+        list: Job details in the same order as `job_ids`.
+    """
+    jobs = {}
+
+    try:
+        async for job_id, job in iter_job_details(job_ids, concurrency=batch_size):
+            jobs[job_id] = job
     except Exception as exc:
         print(f"Error in fetching job details -> {exc}")
 
-    return results
+    # Whatever finished before an error is still returned
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+
+def collapse_duplicate_jobs(jobs, threshold=JOB_DEDUP_THRESHOLD):
+    """
+    Drop reposts of the same job before the results reach the agent, see `dedupe.deduplicate_jobs`.
+    """
+    try:
+        unique_jobs, merges = deduplicate_jobs(jobs, threshold)
+    except Exception as exc:
+        print(f"Error in de-duplicating jobs -> {exc}")
+        return jobs
+    for merge in merges:
+        print(
+            f"Merged duplicate job posting {merge['dropped']} into {merge['kept']} "
+            f"(similarity {merge['similarity']})"
+        )
+    return unique_jobs
+
+
+async def stream_job_search(
+    keywords: str,
+    location_name: str = None,
+    employment_type=None,
+    limit: Optional[int] = 10,
+    job_type=None,
+    experience=None,
+    listed_at=86400,
+    distance=None,
+    batch_size=int(os.environ.get("JOB_FETCH_CONCURRENCY", 5)),
+):
+    """
+    Search for jobs and yield (rank, job_id, job_details) while the search is still paging.
+
+    Details of a result page are fetched as soon as the page arrives, so the next page is
+    downloading while the previous one's details are. All detail fetches share one
+    concurrency cap of `batch_size`. Items arrive in completion order, `rank` is the position
+    of the job in LinkedIn's results.
+    """
+    results = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(1, batch_size))
+    done = object()
+
+    async def fetch_page_details(job_ids, first_rank):
+        ranks = {job_id: first_rank + i for i, job_id in enumerate(job_ids)}
+        async for job_id, job in iter_job_details(job_ids, semaphore=semaphore):
+            await results.put((ranks[job_id], job_id, job))
+
+    async def produce():
+        detail_tasks = []
+        rank = 0
+        try:
+            if os.environ.get("LINKEDIN_SEARCH") == "linkedin_api":
+                job_ids = await asyncio.to_thread(
+                    get_job_ids_from_linkedin_api,
+                    keywords=keywords,
+                    location_name=location_name,
+                    employment_type=employment_type,
+                    limit=limit,
+                    job_type=job_type,
+                    experience=experience,
+                    listed_at=listed_at,
+                    distance=distance,
+                )
+                detail_tasks.append(
+                    asyncio.create_task(fetch_page_details(job_ids, 0))
+                )
+            else:
+                async for page_ids in iter_job_ids(
+                    keywords=keywords,
+                    location_name=location_name,
+                    employment_type=employment_type,
+                    limit=limit,
+                    job_type=job_type,
+                    experience=experience,
+                ):
+                    detail_tasks.append(
+                        asyncio.create_task(fetch_page_details(page_ids, rank))
+                    )
+                    rank += len(page_ids)
+            await asyncio.gather(*detail_tasks)
+        except Exception as exc:
+            print(f"Error in searching jobs -> {exc}")
+        finally:
+            for task in detail_tasks:
+                task.cancel()
+            await results.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await results.get()) is not done:
+            yield item
+    finally:
+        producer.cancel()
+
+
+# Search filters the local job index can't check
+UNINDEXED_FILTERS = ("employment_type", "job_type", "experience")
+
+
+def search_job_index(keywords, location_name=None, limit=10, listed_at=None, **_):
+    """
+    Answer a job search from the local index of previously fetched postings.
+
+    A posting is indexed after it is posted, so only postings indexed within `listed_at`
+    seconds are returned. The results are not live: each one is marked with
+    "source": "cached_index" and the hours since it was fetched.
+    """
+    max_age = JOB_INDEX_MAX_AGE
+    try:
+        max_age = min(max_age, int(listed_at)) if listed_at else max_age
+    except (TypeError, ValueError):
+        pass
+    try:
+        jobs = job_index.search(keywords, location_name, limit=limit or 10, max_age=max_age)
+    except Exception as exc:
+        print(f"Error in searching the local job index -> {exc}")
+        return []
+    now = time.time()
+    return [
+        {
+            **{key: value for key, value in job.items() if key != "indexed_at"},
+            "source": "cached_index",
+            "fetched_hours_ago": round((now - job["indexed_at"]) / 3600, 1),
+        }
+        for job in jobs
+    ]
+
+
+async def search_jobs(**search_params):
+    """
+    Run a paginated job search and return the job details in the order LinkedIn ranked them.
+
+    JOB_SEARCH_MODE decides where results come from:
+    - "online" (default): always ask LinkedIn, the local index is only used when LinkedIn
+      returns nothing (e.g. while it is throttling us).
+    - "index_first": answer from the local index when it has enough matches, otherwise ask LinkedIn.
+    - "offline": only use the local index.
+
+    The index does not know the employment type, workplace type or experience level of a
+    posting, so outside of "offline" mode searches filtering on them are only answered by
+    LinkedIn.
+    """
+    search_mode = os.environ.get("JOB_SEARCH_MODE", "online")
+    use_index = search_mode == "offline" or not any(
+        search_params.get(name) for name in UNINDEXED_FILTERS
+    )
+    if search_mode != "online" and use_index:
+        indexed_jobs = await asyncio.to_thread(search_job_index, **search_params)
+        limit = search_params.get("limit") or 10
+        if search_mode == "offline" or len(indexed_jobs) >= limit:
+            return collapse_duplicate_jobs(indexed_jobs)
+
+    ranked_jobs = [
+        (rank, job) async for rank, _, job in stream_job_search(**search_params)
+    ]
+    jobs = [job for _, job in sorted(ranked_jobs, key=lambda item: item[0])]
+    if use_index and not any(job.get("job_title") for job in jobs):
+        indexed_jobs = await asyncio.to_thread(search_job_index, **search_params)
+        return collapse_duplicate_jobs(indexed_jobs)
+    return collapse_duplicate_jobs(jobs)
+
+
+async def batch_search_jobs(
+    searches: list,
+    batch_size=int(os.environ.get("JOB_FETCH_CONCURRENCY", 5)),
+):
+    """
+    Run several job searches concurrently and fetch the details of their combined results once.
+
+    Args:
+        searches (list): Search parameters, each a dict with the arguments of `get_job_ids`.
+        batch_size (int): Maximum number of job detail requests in flight.
+
+    Returns:
+        list: Details of the de-duplicated jobs. The results of the searches are interleaved,
+        so every search gets its best matches near the top.
+    """
+    results = await asyncio.gather(
+        *[get_job_ids_async(**search) for search in searches],
+        return_exceptions=True,
+    )
+    job_id_lists = []
+    for search, result in zip(searches, results):
+        if isinstance(result, Exception):
+            print(f"Error in searching jobs for {search.get('keywords')} -> {result}")
+            continue
+        job_id_lists.append(result)
+
+    job_ids = []
+    for rank_ids in itertools.zip_longest(*job_id_lists):
+        job_ids.extend(job_id for job_id in rank_ids if job_id is not None)
+    job_ids = list(dict.fromkeys(job_ids))
+
+    jobs = await fetch_all_jobs(job_ids, batch_size=batch_size)
+    return collapse_duplicate_jobs(jobs)
@@ -1,16 +1,58 @@
 # define tools
 import os
+import re
+import time
 import asyncio
+import tempfile
+from typing import List
 from dotenv import load_dotenv
 from langchain.pydantic_v1 import Field
 from langchain.tools import BaseTool, tool, StructuredTool
-from data_loader import load_resume, write_cover_letter_to_doc
-from schemas import JobSearchInput
-from search import get_job_ids, fetch_all_jobs
-from utils import FireCrawlClient, SerperClient
+from async_runner import run_async
+from compaction import compact_jobs
+from chains import get_cover_letter_chain
+from data_loader import (
+    load_resume_cached,
+    write_cover_letter_bundle,
+    write_cover_letter_to_doc,
+    write_cover_letters_to_docs,
+)
+from ranking import rank_jobs
+from resume_profile import build_resume_profile, format_resume_profile, resume_ranking_text
+from schemas import CoverLetterBatchInput, JobSearchInput, JobBatchSearchInput
+from search import search_jobs, batch_search_jobs
+from utils import SerperClient, WebScraper
+from workspace import WorkspaceQuotaError, get_current_workspace
 
 load_dotenv()
 
+# Shared so its API wrappers are built once, results are cached by the client itself
+serper_client = SerperClient()
+# Fetch this many times the requested jobs and keep the ones matching the resume best
+JOB_RANK_OVERFETCH = int(os.environ.get("JOB_RANK_OVERFETCH", 2))
+
+
+def rank_jobs_for_resume(jobs: list, top_k: int) -> list:
+    """
+    Keep the `top_k` jobs matching the uploaded resume best, with their match score.
+
+    Jobs are returned unchanged (only trimmed) when there is no resume to rank against.
+    """
+    try:
+        resume_path = get_current_workspace().resume_path
+        resume_text = (
+            resume_ranking_text(build_resume_profile(resume_path))
+            if os.path.exists(resume_path)
+            else ""
+        )
+        ranked = rank_jobs(jobs, resume_text, top_k=top_k)
+    except Exception as exc:
+        print(f"Error in ranking jobs -> {exc}")
+        return jobs[:top_k]
+    if not resume_text:
+        return [job for _, job in ranked]
+    return [{**job, "resume_match_score": round(score, 3)} for score, job in ranked]
+
 
 # Job search tools
 def linkedin_job_search(
@@ -26,18 +68,20 @@ def linkedin_job_search(
     """
     Search LinkedIn for job postings based on specified criteria. Returns detailed job listings.
     """
-    job_ids = get_job_ids(
-        keywords=keywords,
-        location_name=location_name,
-        employment_type=employment_type,
-        limit=limit,
-        job_type=job_type,
-        listed_at=listed_at,
-        experience=experience,
-        distance=distance,
+    limit = limit or 5
+    job_desc = run_async(
+        search_jobs(
+            keywords=keywords,
+            location_name=location_name,
+            employment_type=employment_type,
+            limit=limit * JOB_RANK_OVERFETCH,
+            job_type=job_type,
+            listed_at=listed_at,
+            experience=experience,
+            distance=distance,
+        )
     )
-    job_desc = asyncio.run(fetch_all_jobs(job_ids))
-    return job_desc
+    return compact_jobs(rank_jobs_for_resume(job_desc, limit))
 
 
 def get_job_search_tool():
@@ -55,6 +99,35 @@ def get_job_search_tool():
     return job_pipeline_tool
 
 
+def linkedin_batch_job_search(searches: list) -> list:
+    """
+    Run several LinkedIn job searches concurrently and return the de-duplicated job listings.
+    """
+    searches = [
+        dict(search) if isinstance(search, dict) else search.dict()
+        for search in searches
+    ]
+    limit = sum(search.get("limit") or 5 for search in searches)
+    for search in searches:
+        search["limit"] = (search.get("limit") or 5) * JOB_RANK_OVERFETCH
+    jobs = run_async(batch_search_jobs(searches))
+    return compact_jobs(rank_jobs_for_resume(jobs, limit))
+
+
+def get_job_batch_search_tool():
+    """
+    Create a tool which runs several job searches in one call.
+    Returns:
+    StructuredTool: A structured tool for the batch job search.
+    """
+    return StructuredTool.from_function(
+        func=linkedin_batch_job_search,
+        name="JobBatchSearchTool",
+        description="Run several LinkedIn job searches at once (e.g. multiple locations or job titles) and return the combined, de-duplicated job listings",
+        args_schema=JobBatchSearchInput,
+    )
+
+
 # Resume Extraction Tool
 class ResumeExtractorTool(BaseTool):
     """
@@ -73,7 +146,7 @@ class ResumeExtractorTool(BaseTool):
         Returns:
         str: The content of the highlight skills, experience, and qualifications relevant to job applications, omitting personal information
         """
-        text = load_resume("temp/resume.pdf")
+        text = load_resume_cached(get_current_workspace().resume_path)
         return text
 
     def _run(self) -> dict:
@@ -99,21 +172,101 @@ def save_cover_letter_for_specific_job(
     Params:
     cover_letter_content: The combine information of resume and job details to tailor the cover letter.
     """
-    filename = f"temp/{company_name}_cover_letter.docx"
+    workspace = get_current_workspace()
+    try:
+        workspace.check_quota(len(cover_letter_content.encode()))
+    except WorkspaceQuotaError as exc:
+        return f"Could not save the cover letter, the session storage is full: {exc}"
+    filename = workspace.path_for(f"{company_name}_cover_letter.docx")
     file = write_cover_letter_to_doc(cover_letter_content, filename)
     abs_path = os.path.abspath(file)
     return f"Here is the download link: {abs_path}"
 
 
-# Web Search Tools
-@tool("google_search")
-def get_google_search_results(
-    query: str = Field(..., description="Search query for web")
-) -> str:
+COVER_LETTER_CONCURRENCY = int(os.environ.get("COVER_LETTER_CONCURRENCY", 4))
+
+
+def _safe_filename(text: str) -> str:
+    return re.sub(r"[^\w-]+", "_", text).strip("_")[:50] or "job"
+
+
+def generate_cover_letters_for_jobs(llm, jobs: list) -> str:
     """
-    search the web for the given query and return the search results.
+    Write a cover letter for every job at once and save them as Word documents.
+
+    The letters are generated concurrently (at most COVER_LETTER_CONCURRENCY at a time) and
+    rendered in a worker pool. A manifest and a zip of all the documents are saved with them.
+    """
+    jobs = [dict(job) if isinstance(job, dict) else job.dict() for job in jobs]
+    workspace = get_current_workspace()
+    if not os.path.exists(workspace.resume_path):
+        return "To generate cover letters, I need the resume. Please upload it first."
+    try:
+        workspace.check_quota()
+    except WorkspaceQuotaError as exc:
+        return f"Could not save the cover letters, the session storage is full: {exc}"
+    resume = format_resume_profile(build_resume_profile(workspace.resume_path))
+
+    inputs = [
+        {
+            "resume": resume,
+            "job": f"Title: {job['job_title']}\nCompany: {job['company_name']}\n"
+            f"Description: {job.get('job_description') or 'not available'}",
+        }
+        for job in jobs
+    ]
+    letters = get_cover_letter_chain(llm).batch(
+        inputs, {"max_concurrency": COVER_LETTER_CONCURRENCY}, return_exceptions=True
+    )
+
+    # Unique per batch, two batches within the same second must not share a directory
+    output_dir = tempfile.mkdtemp(
+        prefix=time.strftime("%Y%m%d-%H%M%S-"), dir=workspace.cover_letters_dir
+    )
+    manifest, documents = [], []
+    for i, (job, letter) in enumerate(zip(jobs, letters), start=1):
+        entry = {"company_name": job["company_name"], "job_title": job["job_title"]}
+        if isinstance(letter, Exception):
+            print(f"Error in generating the cover letter for {job['company_name']} -> {letter}")
+            entry.update(status="failed", error=str(letter), file=None)
+        else:
+            filename = os.path.join(
+                output_dir,
+                f"{i:02d}_{_safe_filename(job['company_name'])}_{_safe_filename(job['job_title'])}.docx",
+            )
+            entry.update(status="generated", file=filename)
+            documents.append((letter, filename))
+        manifest.append(entry)
+
+    write_cover_letters_to_docs(documents)
+    zip_path = write_cover_letter_bundle(manifest, output_dir)
+
+    lines = [
+        f"Generated {len(documents)} of {len(jobs)} cover letters.",
+        f"Download all as zip: {os.path.abspath(zip_path)}",
+    ]
+    for entry in manifest:
+        target = os.path.abspath(entry["file"]) if entry["file"] else f"failed ({entry['error']})"
+        lines.append(f"- {entry['job_title']} at {entry['company_name']}: {target}")
+    return "\n".join(lines)
+
+
+def get_cover_letter_batch_tool(llm):
     """
-    response = SerperClient().search(query)
+    Create a tool which writes cover letters for several jobs in one call with the given LLM.
+    Returns:
+    StructuredTool: A structured tool for the batch cover letter generation.
+    """
+    return StructuredTool.from_function(
+        func=lambda jobs: generate_cover_letters_for_jobs(llm, jobs),
+        name="generate_cover_letters_for_jobs",
+        description="Write cover letters for several jobs at once (e.g. every job of a search result) and return the download links of the Word documents and of a zip with all of them",
+        args_schema=CoverLetterBatchInput,
+    )
+
+
+# Web Search Tools
+def format_search_results(response: dict) -> str:
     items = response.get("items")
     string = []
     for result in items:
@@ -135,13 +288,85 @@ def get_google_search_results(
     return content
 
 
+def google_search(
+    query: str = Field(..., description="Search query for web")
+) -> str:
+    """
+    search the web for the given query and return the search results.
+    """
+    return format_search_results(serper_client.search(query))
+
+
+async def google_search_async(
+    query: str = Field(..., description="Search query for web")
+) -> str:
+    """
+    search the web for the given query and return the search results.
+    """
+    return format_search_results(await serper_client.search_async(query))
+
+
+# Async agents run several searches of one step concurrently through the coroutine
+get_google_search_results = StructuredTool.from_function(
+    func=google_search,
+    coroutine=google_search_async,
+    name="google_search",
+    description="search the web for the given query and return the search results.",
+)
+
+
 @tool("scrape_website")
 def scrape_website(url: str = Field(..., description="Url to be scraped")) -> str:
     """
     Scrape the content of a website and return the text.
     """
     try:
-        content = FireCrawlClient().scrape(url)
+        content = WebScraper().scrape(url)
     except Exception as exc:
         return f"Failed to scrape {url}"
     return content
+
+
+SCRAPE_CONCURRENCY = int(os.environ.get("SCRAPE_CONCURRENCY", 4))
+SCRAPE_TIMEOUT = float(os.environ.get("SCRAPE_TIMEOUT", 60))
+
+
+async def scrape_websites_async(
+    urls: List[str] = Field(..., description="Urls to be scraped"),
+) -> str:
+    """
+    Scrape several websites at once and return the text of each, in the order of the urls.
+    """
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    scraper = WebScraper()
+
+    async def scrape_one(url):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(scraper.scrape_async(url), SCRAPE_TIMEOUT)
+            except asyncio.TimeoutError:
+                return f"Failed to scrape {url}: timed out after {SCRAPE_TIMEOUT:.0f}s"
+            except Exception as exc:
+                return f"Failed to scrape {url}"
+
+    contents = await asyncio.gather(*[scrape_one(url) for url in urls])
+    return "\n\n".join(
+        f"URL: {url}\n{content}\n---" for url, content in zip(urls, contents)
+    )
+
+
+def scrape_websites(
+    urls: List[str] = Field(..., description="Urls to be scraped"),
+) -> str:
+    """
+    Scrape several websites at once and return the text of each, in the order of the urls.
+    """
+    return run_async(scrape_websites_async(urls))
+
+
+scrape_websites_tool = StructuredTool.from_function(
+    func=scrape_websites,
+    coroutine=scrape_websites_async,
+    name="scrape_websites",
+    description="Scrape several websites at once (e.g. the top results of a google search) and return the text of each.",
+)
@@ -1,11 +1,43 @@
 import os
+import copy
+import asyncio
+import time
+import hashlib
+import ipaddress
+import socket
+import threading
+import urllib.parse
+from collections import Counter
+import aiohttp
+from aiohttp.abc import AbstractResolver
 from langchain_community.utilities import GoogleSerperAPIWrapper
 from langchain_community.document_loaders import FireCrawlLoader
 
 from dotenv import load_dotenv
+from async_runner import get_http_session, run_async
+from cache import AsyncSingleFlight, LRUCache, SingleFlight, TTLCache
+from parsers import extract_main_content
 
 load_dotenv()
 
+SEARCH_CACHE_TTL = int(os.environ.get("SEARCH_CACHE_TTL", 24 * 60 * 60))
+# Search results are shared by all sessions of the process, hot queries stay in memory
+search_results_memory = LRUCache(
+    maxsize=int(os.environ.get("SEARCH_CACHE_SIZE", 256)), ttl=SEARCH_CACHE_TTL
+)
+search_results_cache = TTLCache("serper_search", ttl=SEARCH_CACHE_TTL)
+search_single_flight = SingleFlight()
+search_single_flight_async = AsyncSingleFlight()
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+SERPER_TIMEOUT = float(os.environ.get("SERPER_TIMEOUT", 20))
+
+
+def _search_cache_key(query: str, num_results: int) -> str:
+    # Case and spacing don't change what Google returns
+    return f"{num_results}:{' '.join(query.lower().split())}"
+
+
 class SerperClient:
     """
     A client for performing Google searches using the Serper API.
@@ -23,6 +55,7 @@ class SerperClient:
 
     def __init__(self, serper_api_key: str = os.environ.get("SERPER_API_KEY")) -> None:
         self.serper_api_key = serper_api_key
+        self._wrappers = {}
 
     def search(
         self,
@@ -40,12 +73,152 @@ class SerperClient:
             dict: The search results as a dictionary.
 
         """
-        response = GoogleSerperAPIWrapper(k=num_results).results(query=query)
-        # this is to make the response compatible with the response from the google search client
-        items = response.pop("organic", [])
-        response["items"] = items
+        key = _search_cache_key(query, num_results)
+        response = search_results_memory.get(key)
+        if response is None:
+            # Concurrent identical queries wait for the first one instead of all going upstream
+            response = search_single_flight.do(
+                key, lambda: self._search_uncached(key, query, num_results)
+            )
+        return copy.deepcopy(response)
+
+    def _search_uncached(self, key: str, query: str, num_results: int) -> dict:
+        response = search_results_cache.get(key)
+        if response is None:
+            response = self._get_wrapper(num_results).results(query=query)
+            # this is to make the response compatible with the response from the google search client
+            items = response.pop("organic", [])
+            response["items"] = items
+            if items:
+                search_results_cache.set(key, response)
+        search_results_memory.set(key, response)
         return response
 
+    async def search_async(
+        self,
+        query,
+        num_results: int = 5,
+    ):
+        """
+        Asynchronously perform a Google search for the given query and return the search results.
+
+        Uses the pooled HTTP session of the running loop and shares the caches of `search`.
+
+        Args:
+            query (str): The search query.
+            num_results (int, optional): The number of search results to retrieve.
+
+        Returns:
+            dict: The search results as a dictionary.
+        """
+        key = _search_cache_key(query, num_results)
+        response = search_results_memory.get(key)
+        if response is None:
+            response = await search_single_flight_async.do(
+                key, lambda: self._search_uncached_async(key, query, num_results)
+            )
+        return copy.deepcopy(response)
+
+    async def _search_uncached_async(
+        self, key: str, query: str, num_results: int
+    ) -> dict:
+        response = search_results_cache.get(key)
+        if response is None:
+            # Same request GoogleSerperAPIWrapper sends, without blocking the loop
+            async with get_http_session().post(
+                SERPER_SEARCH_URL,
+                json={"q": query, "gl": "us", "hl": "en", "num": num_results},
+                headers={
+                    "X-API-KEY": self.serper_api_key
+                    or os.environ.get("SERPER_API_KEY", ""),
+                    "Content-Type": "application/json",
+                },
+                timeout=aiohttp.ClientTimeout(total=SERPER_TIMEOUT),
+            ) as http_response:
+                http_response.raise_for_status()
+                response = await http_response.json()
+            items = response.pop("organic", [])
+            response["items"] = items
+            if items:
+                search_results_cache.set(key, response)
+        search_results_memory.set(key, response)
+        return response
+
+    def _get_wrapper(self, num_results: int) -> GoogleSerperAPIWrapper:
+        wrapper = self._wrappers.get(num_results)
+        if wrapper is None:
+            wrapper = GoogleSerperAPIWrapper(
+                k=num_results, serper_api_key=self.serper_api_key
+            )
+            self._wrappers[num_results] = wrapper
+        return wrapper
+
+
+def _scrape_cache_key(url: str) -> str:
+    # Fragments and tracking parameters don't change the page content
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (name, value)
+        for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_")
+    ]
+    return urllib.parse.urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            urllib.parse.urlencode(query),
+            "",
+        )
+    )
+
+
+class ScrapeStats:
+    """
+    Counters of how much scraped content was downloaded versus handed to the agents.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def add(self, **counts) -> None:
+        with self._lock:
+            self.counts.update(counts)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+
+SCRAPE_MAX_CHARS = int(os.environ.get("SCRAPE_MAX_CHARS", 10000))
+SCRAPE_CACHE_TTL = int(os.environ.get("SCRAPE_CACHE_TTL", 6 * 60 * 60))
+# URL -> content hash, and content hash -> content, so mirrors of a page are stored once
+scraped_pages_cache = TTLCache("scraped_pages", ttl=SCRAPE_CACHE_TTL)
+scraped_content_cache = TTLCache("scraped_content", ttl=SCRAPE_CACHE_TTL)
+scrape_stats = ScrapeStats()
+
+
+def get_cached_scrape(url: str):
+    """
+    Return the cached content of the url, or None if it wasn't scraped within the TTL.
+    """
+    page = scraped_pages_cache.get(_scrape_cache_key(url))
+    if page is None:
+        return None
+    return scraped_content_cache.get(page["sha256"])
+
+
+def cache_scrape(url: str, content: str) -> None:
+    """
+    Store scraped content for the url, keyed by the hash of the content.
+    """
+    content_hash = hashlib.sha256(content.encode()).hexdigest()
+    scraped_content_cache.set(content_hash, content)
+    scraped_pages_cache.set(
+        _scrape_cache_key(url), {"sha256": content_hash, "scraped_at": time.time()}
+    )
+
 
 class FireCrawlClient:
 
@@ -54,14 +227,244 @@ class FireCrawlClient:
     ) -> None:
         self.firecrawl_api_key = firecrawl_api_key
 
-    def scrape(self, url):
+    def scrape(self, url, max_chars: int = SCRAPE_MAX_CHARS):
+        """
+        Scrape the url and return at most `max_chars` characters of its content.
+
+        Documents are consumed from the loader only until the budget is reached, and the
+        result is cached for SCRAPE_CACHE_TTL seconds.
+        """
+        page_content = get_cached_scrape(url)
+        if page_content is not None:
+            scrape_stats.add(cache_hits=1)
+            return page_content[:max_chars]
+        scrape_stats.add(cache_misses=1)
+
+        page_content = self.scrape_uncached(url, max_chars)
+        if page_content:
+            cache_scrape(url, page_content)
+        return page_content
+
+    def scrape_uncached(self, url, max_chars: int = SCRAPE_MAX_CHARS):
+        """
+        Scrape the url through the FireCrawl service, bypassing the cache.
+        """
         docs = FireCrawlLoader(
             api_key=self.firecrawl_api_key, url=url, mode="scrape"
         ).lazy_load()
 
-        page_content = ""
+        parts = []
+        kept_chars = 0
         for doc in docs:
-            page_content += doc.page_content
+            scrape_stats.add(bytes_fetched=len(doc.page_content.encode()))
+            parts.append(doc.page_content[: max_chars - kept_chars])
+            kept_chars += len(parts[-1])
+            if kept_chars >= max_chars:
+                break
+
+        page_content = "".join(parts)
+        scrape_stats.add(firecrawl_scrapes=1, bytes_kept=len(page_content.encode()))
+        return page_content
+
+
+SCRAPER_BACKEND = os.environ.get("SCRAPER_BACKEND", "auto")
+LOCAL_SCRAPE_TIMEOUT = float(os.environ.get("LOCAL_SCRAPE_TIMEOUT", 15))
+LOCAL_SCRAPE_MAX_BYTES = int(os.environ.get("LOCAL_SCRAPE_MAX_BYTES", 2 * 1024 * 1024))
+# Pages with less main text than this are most likely rendered client side
+LOCAL_SCRAPE_MIN_CHARS = int(os.environ.get("LOCAL_SCRAPE_MIN_CHARS", 200))
+LOCAL_SCRAPE_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+LOCAL_SCRAPE_MAX_REDIRECTS = int(os.environ.get("LOCAL_SCRAPE_MAX_REDIRECTS", 5))
+REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
+# Only for benchmarks and tests against local servers, urls come from the LLM and the web
+LOCAL_SCRAPE_ALLOW_PRIVATE = os.environ.get("LOCAL_SCRAPE_ALLOW_PRIVATE", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class NeedsRenderingError(Exception):
+    """
+    Raised by the local scraper for pages it can't extract without a browser.
+    """
+
+
+class BlockedUrlError(Exception):
+    """
+    Raised for urls the local scraper must not fetch: schemes other than http(s), and hosts
+    resolving to loopback, private, link-local or otherwise non-public addresses.
+    """
+
+
+def is_public_address(host: str) -> bool:
+    address = ipaddress.ip_address(host.split("%")[0])
+    if getattr(address, "ipv4_mapped", None):
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+class PublicAddressResolver(AbstractResolver):
+    """
+    Resolver of the scraper session that only returns public addresses.
+
+    Filtering when connecting, instead of resolving the host on the side first, means a
+    host changing its DNS answer (DNS rebinding) can't get a private address connected to.
+    """
+
+    def __init__(self) -> None:
+        self._resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family=socket.AF_INET) -> list:
+        addresses = await self._resolver.resolve(host, port, family)
+        public = [address for address in addresses if is_public_address(address["host"])]
+        if not public:
+            raise BlockedUrlError(f"{host} resolves to non-public addresses only")
+        return public
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+def get_scraper_session() -> aiohttp.ClientSession:
+    """
+    Return the pooled HTTP session of the local scraper, see `PublicAddressResolver`.
+    """
+    if LOCAL_SCRAPE_ALLOW_PRIVATE:
+        return get_http_session("scraper")
+    return get_http_session("scraper", PublicAddressResolver)
+
+
+def check_public_url(url: str) -> None:
+    """
+    Raise BlockedUrlError unless the url is http(s) and, if its host is an IP address, a
+    public one. Host names are checked by `PublicAddressResolver` when connecting.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise BlockedUrlError(f"Only http(s) urls can be scraped, got {url}")
+    if LOCAL_SCRAPE_ALLOW_PRIVATE:
+        return
+    try:
+        is_public = is_public_address(parsed.hostname)
+    except ValueError:
+        return
+    if not is_public:
+        raise BlockedUrlError(f"{parsed.hostname} is not a public address")
+
+
+class LocalScraper:
+    """
+    Scrapes pages with the pooled HTTP session and extracts their main text locally.
+
+    Much faster than a round trip through FireCrawl for static pages. Pages that need
+    JavaScript to render their content, or that aren't HTML/text, raise NeedsRenderingError.
+    Urls are fetched from our own network, so the url and every redirect are checked with
+    `check_public_url` and only public addresses are connected to.
+    """
+
+    async def _fetch(self, url) -> tuple:
+        for _ in range(LOCAL_SCRAPE_MAX_REDIRECTS + 1):
+            check_public_url(url)
+            async with get_scraper_session().get(
+                url,
+                headers=LOCAL_SCRAPE_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=LOCAL_SCRAPE_TIMEOUT),
+                allow_redirects=False,
+            ) as response:
+                location = response.headers.get("Location")
+                if response.status in REDIRECT_STATUS_CODES and location:
+                    url = urllib.parse.urljoin(str(response.url), location)
+                    continue
+                response.raise_for_status()
+                content_type = response.content_type or ""
+                if content_type not in ("text/html", "application/xhtml+xml", "text/plain"):
+                    raise NeedsRenderingError(f"Unsupported content type {content_type}")
+                # content.read(n) only returns what is buffered, read until EOF or the size cap
+                chunks, size = [], 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= LOCAL_SCRAPE_MAX_BYTES:
+                        break
+                body = b"".join(chunks)[:LOCAL_SCRAPE_MAX_BYTES]
+                return content_type, body, response.charset
+        raise NeedsRenderingError(f"More than {LOCAL_SCRAPE_MAX_REDIRECTS} redirects")
+
+    async def scrape_async(self, url, max_chars: int = SCRAPE_MAX_CHARS) -> str:
+        content_type, body, charset = await self._fetch(url)
+        text = body.decode(charset or "utf-8", errors="replace")
+        scrape_stats.add(bytes_fetched=len(body))
+
+        if content_type == "text/plain":
+            page_content = text
+        else:
+            page = extract_main_content(text)
+            if len(page["text"]) < LOCAL_SCRAPE_MIN_CHARS:
+                raise NeedsRenderingError(f"Only {len(page['text'])} characters of text")
+            page_content = "\n\n".join(part for part in (page["title"], page["text"]) if part)
+
+        page_content = page_content[:max_chars]
+        scrape_stats.add(local_scrapes=1, bytes_kept=len(page_content.encode()))
+        return page_content
+
+    def scrape(self, url, max_chars: int = SCRAPE_MAX_CHARS) -> str:
+        return run_async(self.scrape_async(url, max_chars))
+
+
+class WebScraper:
+    """
+    Scrapes web pages with the backend selected by SCRAPER_BACKEND, sharing one cache.
+
+    Backends:
+        local: fetch and extract locally only.
+        firecrawl: always go through the FireCrawl service.
+        auto: try the local backend first and fall back to FireCrawl for pages that need
+            JavaScript rendering or can't be fetched directly. Urls of non-public
+            addresses raise BlockedUrlError instead.
+    """
+
+    def __init__(self, backend: str = None) -> None:
+        self.backend = backend or SCRAPER_BACKEND
+        if self.backend not in ("auto", "local", "firecrawl"):
+            raise ValueError(f"Unknown scraper backend {self.backend}")
+        self.local_scraper = LocalScraper()
+        self.firecrawl_client = FireCrawlClient()
+
+    async def scrape_async(self, url, max_chars: int = SCRAPE_MAX_CHARS) -> str:
+        """
+        Scrape the url and return at most `max_chars` characters of its main content.
+        """
+        page_content = get_cached_scrape(url)
+        if page_content is not None:
+            scrape_stats.add(cache_hits=1)
+            return page_content[:max_chars]
+        scrape_stats.add(cache_misses=1)
+
+        page_content = None
+        if self.backend != "firecrawl":
+            try:
+                page_content = await self.local_scraper.scrape_async(url, max_chars)
+            except (NeedsRenderingError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if self.backend == "local":
+                    raise
+                print(f"Error in local scraping of {url}, falling back to FireCrawl -> {exc}")
+                scrape_stats.add(firecrawl_fallbacks=1)
+        if page_content is None:
+            # FireCrawl's loader is blocking, run it in a worker thread
+            page_content = await asyncio.to_thread(
+                self.firecrawl_client.scrape_uncached, url, max_chars
+            )
+
+        if page_content:
+            cache_scrape(url, page_content)
+        return page_content
 
-        # limit to 10,000 characters
-        return page_content[:10000]
+    def scrape(self, url, max_chars: int = SCRAPE_MAX_CHARS) -> str:
+        return run_async(self.scrape_async(url, max_chars))
@@ -0,0 +1,206 @@
+import os
+import time
+import shutil
+import threading
+import contextlib
+from contextvars import ContextVar
+from typing import Optional
+
+WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", os.path.join("temp", "sessions"))
+# Sessions unused for this many seconds are removed
+WORKSPACE_MAX_AGE = int(os.environ.get("WORKSPACE_MAX_AGE", 24 * 60 * 60))
+# Least recently used sessions are removed beyond this count or total size
+WORKSPACE_MAX_SESSIONS = int(os.environ.get("WORKSPACE_MAX_SESSIONS", 200))
+WORKSPACE_TOTAL_QUOTA_BYTES = int(
+    os.environ.get("WORKSPACE_TOTAL_QUOTA_BYTES", 1024 * 1024 * 1024)
+)
+WORKSPACE_QUOTA_BYTES = int(os.environ.get("WORKSPACE_QUOTA_BYTES", 50 * 1024 * 1024))
+DEFAULT_WORKSPACE_ID = "default"
+# Touched on every use, its mtime is the last time the session was active
+LAST_USED_MARKER = ".last_used"
+
+
+class WorkspaceQuotaError(Exception):
+    """
+    Raised when writing to a workspace would exceed its disk quota.
+    """
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+class Workspace:
+    """
+    The private directory of one session, holding its resume and generated cover letters.
+
+    Attributes:
+        workspace_id (str): Identifier of the session owning the workspace.
+        path (str): Directory of the workspace.
+        quota_bytes (int): Maximum size of the workspace on disk.
+    """
+
+    def __init__(
+        self, workspace_id: str, path: str, quota_bytes: int = WORKSPACE_QUOTA_BYTES
+    ) -> None:
+        self.workspace_id = workspace_id
+        self.path = path
+        self.quota_bytes = quota_bytes
+
+    @property
+    def resume_path(self) -> str:
+        return os.path.join(self.path, "resume.pdf")
+
+    @property
+    def cover_letters_dir(self) -> str:
+        path = os.path.join(self.path, "cover_letters")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def path_for(self, filename: str) -> str:
+        """
+        Return the path of a file in the workspace, keeping it inside the workspace directory.
+        """
+        return os.path.join(self.path, os.path.basename(filename))
+
+    def touch(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, LAST_USED_MARKER), "a"):
+            pass
+        os.utime(os.path.join(self.path, LAST_USED_MARKER))
+
+    def size(self) -> int:
+        return _directory_size(self.path)
+
+    def check_quota(self, extra_bytes: int = 0) -> None:
+        """
+        Raise WorkspaceQuotaError if the workspace can't take `extra_bytes` more.
+        """
+        used = self.size()
+        if used + extra_bytes > self.quota_bytes:
+            raise WorkspaceQuotaError(
+                f"Workspace {self.workspace_id} would use {used + extra_bytes} of "
+                f"{self.quota_bytes} bytes"
+            )
+
+
+class WorkspaceManager:
+    """
+    Creates the workspace of each session under one root and evicts stale ones.
+
+    Workspaces unused for `max_age` seconds are removed, then the least recently used ones
+    until at most `max_sessions` remain and they fit in `total_quota_bytes`. The workspace
+    being requested is never evicted.
+    """
+
+    def __init__(
+        self,
+        root: str = WORKSPACE_ROOT,
+        max_age: int = WORKSPACE_MAX_AGE,
+        max_sessions: int = WORKSPACE_MAX_SESSIONS,
+        total_quota_bytes: int = WORKSPACE_TOTAL_QUOTA_BYTES,
+        quota_bytes: int = WORKSPACE_QUOTA_BYTES,
+    ) -> None:
+        self.root = root
+        self.max_age = max_age
+        self.max_sessions = max_sessions
+        self.total_quota_bytes = total_quota_bytes
+        self.quota_bytes = quota_bytes
+        self._lock = threading.Lock()
+
+    def get(self, workspace_id: Optional[str] = None) -> Workspace:
+        """
+        Return the workspace of the session, creating it (and evicting stale ones) if needed.
+        """
+        workspace_id = os.path.basename(workspace_id or DEFAULT_WORKSPACE_ID)
+        workspace = Workspace(
+            workspace_id, os.path.join(self.root, workspace_id), self.quota_bytes
+        )
+        with self._lock:
+            is_new = not os.path.isdir(workspace.path)
+            workspace.touch()
+            if is_new:
+                self._evict(keep=workspace_id)
+        return workspace
+
+    def evict(self) -> list:
+        """
+        Remove stale workspaces.
+
+        Returns:
+            list: The ids of the removed workspaces.
+        """
+        with self._lock:
+            return self._evict()
+
+    def _last_used(self, path: str) -> float:
+        try:
+            return os.path.getmtime(os.path.join(path, LAST_USED_MARKER))
+        except OSError:
+            return os.path.getmtime(path)
+
+    def _evict(self, keep: Optional[str] = None) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        now = time.time()
+        sessions = []
+        for workspace_id in os.listdir(self.root):
+            path = os.path.join(self.root, workspace_id)
+            if workspace_id == keep or not os.path.isdir(path):
+                continue
+            sessions.append((self._last_used(path), workspace_id, path))
+        # Most recently used first, evicted from the end
+        sessions.sort(reverse=True)
+
+        # The kept workspace counts towards the session limit
+        max_sessions = self.max_sessions - (1 if keep else 0)
+        total_size = _directory_size(self.root)
+        evicted = []
+        while sessions:
+            last_used, workspace_id, path = sessions[-1]
+            if (
+                now - last_used <= self.max_age
+                and len(sessions) <= max_sessions
+                and total_size <= self.total_quota_bytes
+            ):
+                break
+            sessions.pop()
+            total_size -= _directory_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            evicted.append(workspace_id)
+        return evicted
+
+
+workspace_manager = WorkspaceManager()
+_current_workspace: ContextVar[Optional[Workspace]] = ContextVar(
+    "current_workspace", default=None
+)
+
+
+def get_current_workspace() -> Workspace:
+    """
+    Return the workspace of the session being served, or the default workspace outside of one.
+    """
+    workspace = _current_workspace.get()
+    if workspace is None:
+        workspace = workspace_manager.get(DEFAULT_WORKSPACE_ID)
+    return workspace
+
+
+@contextlib.contextmanager
+def use_workspace(workspace_id: Optional[str]):
+    """
+    Make the workspace of the session current for the tools called inside the block.
+    """
+    token = _current_workspace.set(workspace_manager.get(workspace_id))
+    try:
+        yield _current_workspace.get()
+    finally:
+        _current_workspace.reset(token)